@@ -0,0 +1,158 @@
+from collections import OrderedDict
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Union
+import asyncio
+import json
+import os
+
+from . import schemas
+from .bulk import BULK_MAX_ITEMS, _format_validation_error
+from .services import content_generation_service, user_profile_service
+
+# Generations run at once by one batch request
+BATCH_GENERATION_WORKERS = int(os.getenv("BATCH_GENERATION_WORKERS", 4))
+# Analyzed profiles kept while a batch runs, so repeated users are loaded once
+BATCH_PROFILE_CACHE_SIZE = 1000
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_DONE = object()
+
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.decode()
+    if buffer.strip():
+        yield buffer.decode()
+
+
+async def _iterate(items):
+    for item in items:
+        yield item
+
+
+async def request_items(request: Request) -> AsyncIterator[Union[str, Dict[str, Any]]]:
+    """
+    Get the items of a batch request body
+
+    An NDJSON body is read one line at a time while the batch runs. A JSON
+    array is parsed up front and limited to BULK_MAX_ITEMS, so its errors
+    can still be reported with a status code.
+    """
+    if request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE:
+        return _ndjson_lines(request)
+    try:
+        items = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON array of items")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch requests are limited to {BULK_MAX_ITEMS} items; send NDJSON for larger batches")
+    return _iterate(items)
+
+
+async def _generate_one(index: int, raw: Union[str, Dict[str, Any]], profile_of, persist, fresh: bool) -> Dict[str, Any]:
+    try:
+        item = schemas.ContentGenerationItem(**(json.loads(raw) if isinstance(raw, str) else raw))
+    except ValidationError as e:
+        return {"index": index, "status": "error", "error": _format_validation_error(e)}
+    except (TypeError, ValueError) as e:
+        return {"index": index, "status": "error", "error": f"Invalid item: {e}"}
+
+    result = {"index": index, "user_id": item.user_id, "topic": item.topic}
+    if item.content_type not in content_generation_service.GENERATION_SPECS:
+        return {**result, "status": "error", "error": f"Unsupported content type: {item.content_type}"}
+    profile = await profile_of(item.user_id)
+    if profile is None:
+        return {**result, "status": "error", "error": "User not found"}
+
+    content = await content_generation_service.agenerate_content(profile, item.topic, item.content_type, fresh)
+    result.update(content)
+    if persist is not None and content["status"] == "generated":
+        result["content_id"] = await persist({
+            "user_id": item.user_id,
+            "title": content["title"],
+            "body": content["body"],
+            "content_type": content["content_type"],
+        })
+    return result
+
+
+async def generate_batch(items: AsyncIterator[Union[str, Dict[str, Any]]],
+                         load_user: Callable[[int], Awaitable[Optional[Dict[str, Any]]]],
+                         persist: Optional[Callable[[Dict[str, Any]], Awaitable[int]]] = None,
+                         workers: int = BATCH_GENERATION_WORKERS, fresh: bool = False) -> AsyncIterator[str]:
+    """
+    Generate content for each item with a bounded worker pool, yielding NDJSON lines as results complete
+
+    Items are pulled from the source only as workers free up and results are
+    yielded as soon as they are ready, so memory does not grow with the batch.
+    Lines carry the item's index since they arrive in completion order.
+    Closing the generator (e.g. on client disconnect) cancels the workers.
+    """
+    workers = max(workers, 1)
+    pending: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    results: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    profiles: "OrderedDict[int, Any]" = OrderedDict()
+
+    async def profile_of(user_id: int) -> Optional[Dict[str, Any]]:
+        if user_id in profiles:
+            profiles.move_to_end(user_id)
+            return profiles[user_id]
+        user = await load_user(user_id)
+        profile = user_profile_service.analyze_user_profile(user) if user is not None else None
+        profiles[user_id] = profile
+        if len(profiles) > BATCH_PROFILE_CACHE_SIZE:
+            profiles.popitem(last=False)
+        return profile
+
+    async def produce():
+        index = 0
+        error = None
+        try:
+            async for item in items:
+                await pending.put((index, item))
+                index += 1
+        except Exception as e:
+            error = e
+        # Not in a finally: once cancelled, nothing is left to drain the queues
+        for _ in range(workers):
+            await pending.put(_DONE)
+        if error is not None:
+            raise error
+
+    async def work():
+        while True:
+            job = await pending.get()
+            if job is _DONE:
+                break
+            index, item = job
+            try:
+                result = await _generate_one(index, item, profile_of, persist, fresh)
+            except Exception as e:
+                result = {"index": index, "status": "error", "error": str(e)}
+            await results.put(result)
+        await results.put(_DONE)
+
+    tasks = [asyncio.ensure_future(produce())] + [asyncio.ensure_future(work()) for _ in range(workers)]
+    try:
+        finished = 0
+        while finished < workers:
+            result = await results.get()
+            if result is _DONE:
+                finished += 1
+                continue
+            yield json.dumps(result, default=str) + "\n"
+        # Surface a failure reading the request body
+        await tasks[0]
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
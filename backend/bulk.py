@@ -0,0 +1,142 @@
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update, bindparam, func, text
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import os
+
+# Largest number of items accepted by a single bulk request
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 10000))
+
+# Ids per IN (...) lookup when checking which rows exist
+LOOKUP_CHUNK_SIZE = 500
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def _existing_ids(db, column, ids: Iterable[int]) -> Set[int]:
+    """
+    Get the subset of ids present in a column using chunked IN lookups
+    """
+    ids = list(ids)
+    found = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(db.execute(select(column).where(column.in_(chunk))).scalars().all())
+    return found
+
+
+def _insert_rows(db, table, rows: List[Dict[str, Any]]) -> List[int]:
+    """
+    Insert rows with one executemany INSERT and return their ids in order
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(insert(table), rows)
+        # The write lock is held until commit, so the new rows hold the highest rowids
+        last_id = db.execute(select(func.max(table.c.id))).scalar()
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    # Reserve ids from the table's sequence, then insert them explicitly
+    ids = db.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {"table": table.name, "count": len(rows)}
+    ).scalars().all()
+    db.execute(insert(table), [dict(row, id=row_id) for row, row_id in zip(rows, ids)])
+    return list(ids)
+
+
+def _update_rows(db, table, rows: List[Tuple[int, Dict[str, Any]]]):
+    """
+    Update rows by id with a single executemany UPDATE
+    """
+    columns = list(rows[0][1].keys())
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values({column: bindparam(f"b_{column}") for column in columns})
+    )
+    params = []
+    for row_id, values in rows:
+        row_params = {f"b_{column}": values[column] for column in columns}
+        row_params["b_id"] = row_id
+        params.append(row_params)
+    db.execute(statement, params)
+
+
+def updated_ids(result: Dict[str, Any]) -> List[int]:
+    """
+    Get the ids of the rows a bulk_write result updated
+    """
+    return [item["id"] for item in result["results"] if item["status"] == "updated"]
+
+
+def bulk_write(db, model, schema, items: List[Dict[str, Any]],
+               parent: Optional[Tuple[str, Any]] = None,
+               on_write: Optional[Callable[[Any, List[Dict[str, Any]]], Any]] = None) -> Dict[str, Any]:
+    """
+    Validate a list of items and write them in one transaction with batched statements
+
+    Items carrying an "id" replace that row's fields (like PUT); the others are
+    inserted. parent is an optional (foreign key field, parent model) pair that is
+    checked for all items with one lookup. Invalid items are reported and skipped.
+    on_write is called with the session and the written values before commit.
+    """
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Bulk requests are limited to {BULK_MAX_ITEMS} items")
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    valid: List[Tuple[int, Optional[int], Dict[str, Any]]] = []
+
+    def fail(index: int, error: str):
+        results[index] = {"index": index, "id": None, "status": "error", "error": error}
+
+    for index, item in enumerate(items):
+        data = dict(item)
+        row_id = data.pop("id", None)
+        try:
+            valid.append((index, row_id, schema(**data).dict()))
+        except ValidationError as e:
+            fail(index, _format_validation_error(e))
+
+    # Check referenced parents and rows to update with one query each
+    if parent is not None:
+        parent_key, parent_model = parent
+        known_parents = _existing_ids(db, parent_model.id, {values[parent_key] for _, _, values in valid})
+        for index, _, values in valid:
+            if values[parent_key] not in known_parents:
+                fail(index, f"{parent_model.__name__} not found")
+
+    update_ids = {row_id for index, row_id, _ in valid if row_id is not None and results[index] is None}
+    known_rows = _existing_ids(db, model.id, update_ids)
+    for index, row_id, _ in valid:
+        if row_id is not None and row_id not in known_rows and results[index] is None:
+            fail(index, f"{model.__name__} not found")
+
+    creates = [(index, values) for index, row_id, values in valid if row_id is None and results[index] is None]
+    updates = [(index, row_id, values) for index, row_id, values in valid if row_id is not None and results[index] is None]
+
+    try:
+        created_ids = _insert_rows(db, model.__table__, [values for _, values in creates]) if creates else []
+        if updates:
+            _update_rows(db, model.__table__, [(row_id, values) for _, row_id, values in updates])
+        if on_write is not None and (creates or updates):
+            on_write(db, [values for _, values in creates] + [values for _, _, values in updates])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    for (index, _), row_id in zip(creates, created_ids):
+        results[index] = {"index": index, "id": row_id, "status": "created", "error": None}
+    for index, row_id, _ in updates:
+        results[index] = {"index": index, "id": row_id, "status": "updated", "error": None}
+
+    return {
+        "created": len(creates),
+        "updated": len(updates),
+        "failed": len(items) - len(creates) - len(updates),
+        "results": results,
+    }
@@ -0,0 +1,352 @@
+from collections import OrderedDict
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import inspect
+from contextlib import closing
+from typing import Any, Dict, Iterable, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Cache backend: "auto" (Redis when REDIS_URL is set, else in-process), "redis", "memory" or "none"
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "auto").lower()
+REDIS_URL = os.getenv("REDIS_URL", "")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", 60))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "linkedin_ai:")
+# Keep Redis round trips short so a slow cache never stalls a request
+CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", 0.25))
+
+# Generated content cache: "auto" (Redis when REDIS_URL is set, else a SQLite file), "redis", "disk", "memory" or "none"
+PROMPT_CACHE_BACKEND = os.getenv("PROMPT_CACHE_BACKEND", "auto").lower()
+PROMPT_CACHE_PATH = os.getenv("PROMPT_CACHE_PATH", os.path.join(tempfile.gettempdir(), "linkedin_ai_prompt_cache.db"))
+PROMPT_CACHE_TTL_SECONDS = int(os.getenv("PROMPT_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+PROMPT_CACHE_MAX_ENTRIES = int(os.getenv("PROMPT_CACHE_MAX_ENTRIES", 5000))
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with per-entry TTLs
+    """
+    name = "memory"
+    blocking = False
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache:
+    """
+    Cache shared by all workers, stored in Redis
+    """
+    name = "redis"
+    # Network round trips are moved off the event loop by the async helpers
+    blocking = True
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(
+            url, socket_timeout=CACHE_REDIS_TIMEOUT, socket_connect_timeout=CACHE_REDIS_TIMEOUT
+        )
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(CACHE_KEY_PREFIX + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: int):
+        self.client.set(CACHE_KEY_PREFIX + key, value, ex=ttl)
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*[CACHE_KEY_PREFIX + key for key in keys])
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=CACHE_KEY_PREFIX + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class DiskCache:
+    """
+    LRU cache with per-entry TTLs in a SQLite file shared by all workers on a host
+    """
+    name = "disk"
+    blocking = True
+
+    def __init__(self, path: str, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived autocommit connection per call, so workers and threads never share one
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                return None
+            connection.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int):
+        now = time.time()
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def delete(self, *keys: str):
+        with closing(self._connect()) as connection:
+            connection.executemany("DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self):
+        with closing(self._connect()) as connection:
+            connection.execute("DELETE FROM cache_entries")
+
+    def size(self) -> int:
+        with closing(self._connect()) as connection:
+            return connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    JSON response cache with hit/miss counters
+
+    Backend errors are counted and treated as misses, so an unavailable
+    Redis degrades to reading from the database. A backend_factory defers
+    creating the backend (and connecting to Redis) until first use.
+    """
+
+    def __init__(self, backend=None, ttl: int = CACHE_TTL_SECONDS, backend_factory=None):
+        self._backend = backend
+        self._backend_factory = backend_factory
+        self._backend_lock = threading.Lock()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.sets = self.invalidations = self.errors = 0
+
+    @property
+    def backend(self):
+        if self._backend_factory is not None:
+            with self._backend_lock:
+                if self._backend_factory is not None:
+                    self._backend = self._backend_factory()
+                    self._backend_factory = None
+        return self._backend
+
+    def _incr(self, counter: str, amount: int = 1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def get(self, key: str) -> Optional[Any]:
+        backend = self.backend
+        if backend is None:
+            return None
+        try:
+            value = backend.get(key)
+        except Exception:
+            self._incr("errors")
+            value = None
+        self._incr("hits" if value is not None else "misses")
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> Any:
+        """
+        Store a JSON-serializable value and return it
+        """
+        backend = self.backend
+        if backend is not None:
+            try:
+                backend.set(key, json.dumps(value), ttl or self.ttl)
+                self._incr("sets")
+            except Exception:
+                self._incr("errors")
+        return value
+
+    def invalidate(self, *keys: str):
+        backend = self.backend
+        if backend is None or not keys:
+            return
+        try:
+            backend.delete(*keys)
+            self._incr("invalidations", len(keys))
+        except Exception:
+            self._incr("errors")
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    async def _run(self, method, *args):
+        if getattr(self.backend, "blocking", False):
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return await self._run(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None) -> Any:
+        return await self._run(self.set, key, value, ttl)
+
+    async def ainvalidate(self, *keys: str):
+        await self._run(self.invalidate, *keys)
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.sets = self.invalidations = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        backend = self.backend
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": backend.name if backend is not None else "none",
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "sets": self.sets,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+            }
+        stats["entries"] = backend.size() if backend is not None else 0
+        return stats
+
+
+def create_backend(kind: str = CACHE_BACKEND, url: str = REDIS_URL):
+    """
+    Create the configured cache backend, falling back to the in-process LRU
+    """
+    if kind == "none":
+        return None
+    if kind == "memory" or (kind == "auto" and not url):
+        return MemoryCache()
+    try:
+        backend = RedisCache(url)
+        backend.client.ping()
+        return backend
+    except Exception as e:
+        print(f"Redis cache unavailable ({e}), using the in-process cache")
+        return MemoryCache()
+
+
+def create_prompt_backend(kind: str = PROMPT_CACHE_BACKEND, url: str = REDIS_URL, path: str = PROMPT_CACHE_PATH):
+    """
+    Create the generated content cache backend, falling back to the SQLite file
+
+    Redis bounds its size with its own eviction policy (e.g. allkeys-lru).
+    """
+    if kind == "none":
+        return None
+    if kind == "memory":
+        return MemoryCache(max_entries=PROMPT_CACHE_MAX_ENTRIES)
+    if kind == "redis" or (kind == "auto" and url):
+        try:
+            backend = RedisCache(url)
+            backend.client.ping()
+            return backend
+        except Exception as e:
+            print(f"Redis prompt cache unavailable ({e}), using {path}")
+    return DiskCache(path, max_entries=PROMPT_CACHE_MAX_ENTRIES)
+
+
+def serialize(row: Any) -> Dict[str, Any]:
+    """
+    Convert an ORM row to a JSON-safe dict of its column values
+    """
+    if isinstance(row, dict):
+        return jsonable_encoder(row)
+    return jsonable_encoder({attr.key: getattr(row, attr.key) for attr in inspect(row).mapper.column_attrs})
+
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def content_key(content_id: int) -> str:
+    return f"content:{content_id}"
+
+
+def content_analytics_key(content_id: int) -> str:
+    return f"analytics:content:{content_id}"
+
+
+def prompt_key(prompt: str, params: Dict[str, Any]) -> str:
+    """
+    Content-addressed key for a rendered prompt and the model parameters
+    """
+    payload = json.dumps({"prompt": prompt, "params": params}, sort_keys=True)
+    return f"prompt:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+def keys_for(make_key, ids: Iterable[Any]) -> list:
+    return [make_key(value) for value in set(ids) if value is not None]
+
+
+response_cache = ResponseCache(backend_factory=create_backend)
+prompt_cache = ResponseCache(ttl=PROMPT_CACHE_TTL_SECONDS, backend_factory=create_prompt_backend)
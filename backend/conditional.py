@@ -0,0 +1,167 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from sqlalchemy import select, func
+from typing import Any, List, NamedTuple, Optional
+import hashlib
+
+
+class Version(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _make_version(*parts: Any, changed_at: Any = None) -> Version:
+    changed_at = _as_datetime(changed_at)
+    digest = hashlib.blake2b(
+        "|".join(str(part) for part in parts + (changed_at.isoformat() if changed_at else "",)).encode(),
+        digest_size=12,
+    ).hexdigest()
+    # Weak: the tag tracks the row version rather than the exact response bytes
+    return Version(f'W/"{digest}"', changed_at)
+
+
+def version_of(model, row: Any) -> Version:
+    """
+    Get the version of a row (ORM object or dict) from its id and timestamps
+    """
+    if not isinstance(row, dict):
+        row = {field: getattr(row, field) for field in ("id", "created_at", "updated_at")}
+    return _make_version(model.__tablename__, row["id"], changed_at=row["updated_at"] or row["created_at"])
+
+
+def row_version(db, model, *criteria) -> Optional[Version]:
+    """
+    Get the version of the first row (by id) matching the criteria, reading only its id and timestamps
+    """
+    row = db.execute(
+        select(model.id, model.created_at, model.updated_at).where(*criteria).order_by(model.id).limit(1)
+    ).mappings().first()
+    return version_of(model, row) if row is not None else None
+
+
+def _list_version(model, count: int, id_sum: Any, changed_at: Any) -> Version:
+    # Clients keep one ETag per URL, so the query parameters need not be part of it
+    return _make_version(model.__tablename__, count, id_sum, changed_at=changed_at)
+
+
+def rows_version(model, rows: List[Any]) -> Optional[Version]:
+    """
+    Get the version of loaded rows, matching what query_version computes in SQL
+    """
+    if not rows:
+        return None
+    changed = [row.updated_at or row.created_at for row in rows]
+    changed = [moment for moment in changed if moment is not None]
+    return _list_version(model, len(rows), sum(row.id for row in rows), max(changed) if changed else None)
+
+
+def query_version(db, model, query) -> Optional[Version]:
+    """
+    Get the version of the rows a SELECT would return, or None if there are none
+
+    Aggregates ids and timestamps over the query (keeping its filters, order
+    and limit) instead of loading the rows.
+    """
+    rows = query.with_only_columns(
+        model.id, func.coalesce(model.updated_at, model.created_at).label("changed_at")
+    ).subquery()
+    count, id_sum, changed_at = db.execute(
+        select(func.count(), func.sum(rows.c.id), func.max(rows.c.changed_at))
+    ).one()
+    if not count:
+        return None
+    return _list_version(model, count, id_sum, changed_at)
+
+
+def _http_date(moment: datetime) -> str:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def evaluate(request: Request, response: Response, version: Optional[Version]) -> Optional[Response]:
+    """
+    Return a 304 response if the client's copy is current, otherwise set the validators on response
+    """
+    if version is None:
+        return None
+    headers = {"ETag": version.etag}
+    if version.last_modified is not None:
+        headers["Last-Modified"] = _http_date(version.last_modified)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, version.etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since and version.last_modified
+                            and _not_modified_since(if_modified_since, version.last_modified))
+
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+def respond(request: Request, response: Response, version: Optional[Version], body: Any) -> Any:
+    """
+    Return the body with ETag/Last-Modified set, or a 304 if the client's copy is current
+    """
+    not_modified = evaluate(request, response, version)
+    return not_modified if not_modified is not None else body
+
+
+# The prechecks take the session first so async routers can call them through run_sync
+
+def precheck_row(db, request: Request, response: Response, model, *criteria) -> Optional[Response]:
+    """
+    Answer a conditional request for one row with a 304 from its id and timestamps alone
+    """
+    if not is_conditional(request):
+        return None
+    return evaluate(request, response, row_version(db, model, *criteria))
+
+
+def precheck_query(db, request: Request, response: Response, model, query) -> Optional[Response]:
+    """
+    Answer a conditional request for a list with a 304 from an aggregate version query
+    """
+    if not is_conditional(request):
+        return None
+    return evaluate(request, response, query_version(db, model, query))
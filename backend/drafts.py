@@ -0,0 +1,167 @@
+from collections import Counter, OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Minimum cosine similarity for a previous draft to be reused
+DRAFT_SIMILARITY_THRESHOLD = float(os.getenv("DRAFT_SIMILARITY_THRESHOLD", 0.75))
+DRAFT_STORE_TTL_SECONDS = int(os.getenv("DRAFT_STORE_TTL_SECONDS", 7 * 24 * 3600))
+DRAFT_STORE_MAX_ENTRIES = int(os.getenv("DRAFT_STORE_MAX_ENTRIES", 5000))
+# Hashing-trick vector size, large enough that unrelated words rarely share a bucket
+DRAFT_FEATURE_BUCKETS = 2 ** 20
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from how in into is it of on or our the their this to what why with your".split()
+)
+
+
+def _tokens(text: str):
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if token in STOP_WORDS:
+            continue
+        # Cheap plural folding so "trends" and "trend" share a feature
+        yield token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+
+
+def features(text: str) -> Counter:
+    """
+    Hash the words and word pairs of a text into term weights
+
+    crc32 keeps the buckets stable across processes, unlike hash().
+    """
+    tokens = list(_tokens(text))
+    terms = Counter(zlib.crc32(token.encode()) % DRAFT_FEATURE_BUCKETS for token in tokens)
+    # Adjacent word pairs, unordered so "FinTech trends" matches "trends in FinTech", at half weight
+    for pair in zip(tokens, tokens[1:]):
+        terms[zlib.crc32(" ".join(sorted(pair)).encode()) % DRAFT_FEATURE_BUCKETS] += 0.5
+    return terms
+
+
+class Match(NamedTuple):
+    draft: Any
+    text: str
+    similarity: float
+
+
+class DraftStore:
+    """
+    In-process store of generated drafts, looked up by TF-IDF cosine similarity
+
+    Drafts are partitioned by scope (content type, tone and model parameters)
+    and indexed by feature, so a lookup only scores drafts sharing a term with
+    the request. IDF weights come from the drafts in the store.
+    """
+
+    def __init__(self, threshold: float = DRAFT_SIMILARITY_THRESHOLD, ttl: int = DRAFT_STORE_TTL_SECONDS,
+                 max_entries: int = DRAFT_STORE_MAX_ENTRIES):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Any]" = OrderedDict()
+        self._postings: Dict[Any, set] = {}
+        self._ids: Dict[Any, int] = {}
+        self._document_frequency: Counter = Counter()
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def _remove(self, entry_id: int):
+        scope, text, _, terms, _ = self._entries.pop(entry_id)
+        self._ids.pop((scope, text), None)
+        for term in terms:
+            postings = self._postings.get((scope, term))
+            if postings is not None:
+                postings.discard(entry_id)
+                if not postings:
+                    del self._postings[scope, term]
+            self._document_frequency[term] -= 1
+            if self._document_frequency[term] <= 0:
+                del self._document_frequency[term]
+
+    def _weights(self, terms: Counter) -> Dict[int, float]:
+        documents = len(self._entries)
+        weights = {
+            term: count * (math.log((1 + documents) / (1 + self._document_frequency[term])) + 1)
+            for term, count in terms.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def put(self, scope: str, text: str, draft: Any):
+        terms = features(text)
+        if not terms:
+            return
+        with self._lock:
+            # A regenerated draft replaces the previous one for the same text
+            if (scope, text) in self._ids:
+                self._remove(self._ids[scope, text])
+            entry_id = self._next_id
+            self._next_id += 1
+            self._ids[scope, text] = entry_id
+            self._entries[entry_id] = (scope, text, draft, terms, time.monotonic() + self.ttl)
+            for term in terms:
+                self._postings.setdefault((scope, term), set()).add(entry_id)
+                self._document_frequency[term] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def find(self, scope: str, text: str, threshold: Optional[float] = None) -> Optional[Match]:
+        """
+        Return the most similar draft in the scope if it reaches the threshold
+        """
+        threshold = self.threshold if threshold is None else threshold
+        terms = features(text)
+        best = None
+        with self._lock:
+            candidates = set()
+            for term in terms:
+                candidates |= self._postings.get((scope, term), set())
+            query = self._weights(terms)
+            now = time.monotonic()
+            for entry_id in candidates:
+                _, entry_text, draft, entry_terms, expires_at = self._entries[entry_id]
+                if expires_at <= now:
+                    self._remove(entry_id)
+                    continue
+                weights = self._weights(entry_terms)
+                similarity = sum(weight * weights.get(term, 0.0) for term, weight in query.items())
+                if similarity >= threshold and (best is None or similarity > best[2]):
+                    best = (entry_id, entry_text, similarity, draft)
+            if best is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best[0])
+            self.hits += 1
+        return Match(best[3], best[1], round(min(best[2], 1.0), 4))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._ids.clear()
+            self._document_frequency.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "threshold": self.threshold,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+draft_store = DraftStore()
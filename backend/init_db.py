@@ -1,14 +1,14 @@
-from sqlalchemy import create_engine
-from .database import Base, DATABASE_URL
-from .models import user, content, analytics
+from . import database, migrations
 
 def init_db():
     """
-    Initialize the database by creating all tables
+    Initialize the database by applying all pending schema migrations
     """
-    engine = create_engine(DATABASE_URL)
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    engine = database.connect_with_fallback()
+    applied = migrations.upgrade(engine)
+    if applied:
+        print(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+    print(f"Database schema is at version {migrations.current_version(engine)}")
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
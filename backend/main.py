@@ -1,15 +1,24 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import users, content, analytics, linkedin, auth
-from .database import engine, Base
+from .routers import users, content, analytics, linkedin, auth, metrics
+from .routers import async_users, async_content, async_analytics
+from . import database, migrations
+from .database import DB_MODE
+import time
 
-# Create all database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Verify the database is reachable and migrated (see backend/init_db.py)
+    if not database.DB_SKIP_SCHEMA_CHECK:
+        migrations.check_schema(database.connect_with_fallback())
+    yield
 
 app = FastAPI(
     title="LinkedIn Personal Branding AI Agent",
     description="An autonomous AI agent that researches, creates, and posts LinkedIn content for personal branding.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -21,12 +30,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    # Keep the client's reads on the primary for a while after a successful write,
+    # so it sees its own changes even when replicas lag behind
+    response = await call_next(request)
+    if (database.replica_router.replicas and request.method not in ("GET", "HEAD", "OPTIONS")
+            and response.status_code < 400):
+        response.set_cookie(
+            database.READ_PRIMARY_COOKIE,
+            str(time.time() + database.DB_READ_YOUR_WRITES_SECONDS),
+            max_age=database.DB_READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+        )
+    return response
+
+# Select the sync (threadpool) or async (event loop) database routers
+if DB_MODE == "async":
+    users_router, content_router, analytics_router = async_users.router, async_content.router, async_analytics.router
+else:
+    users_router, content_router, analytics_router = users.router, content.router, analytics.router
+
 # Include routers
-app.include_router(users.router, prefix="/api/v1/users", tags=["users"])
-app.include_router(content.router, prefix="/api/v1/content", tags=["content"])
-app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["analytics"])
+app.include_router(users_router, prefix="/api/v1/users", tags=["users"])
+app.include_router(content_router, prefix="/api/v1/content", tags=["content"])
+app.include_router(analytics_router, prefix="/api/v1/analytics", tags=["analytics"])
 app.include_router(linkedin.router, prefix="/api/v1/linkedin", tags=["linkedin"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
+app.include_router(metrics.router, prefix="/api/v1/metrics", tags=["metrics"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,160 @@
+from sqlalchemy import Table, Column, Integer, String, DateTime, MetaData, inspect, select, func, text
+from sqlalchemy.sql import table, column
+from typing import Callable, List, Tuple
+import json
+
+from .database import Base
+from . import models, snapshots
+from .schemas.user import parse_profile_field, PROFILE_LIST_FIELDS, STRING_LIST_FIELDS
+
+# Bookkeeping table recording which migrations have been applied
+migration_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+class SchemaVersionError(RuntimeError):
+    """
+    Raised when the database schema is older than the application expects
+    """
+
+
+def _create_initial_tables(connection):
+    """
+    Create the users, content and analytics tables
+    """
+    Base.metadata.create_all(bind=connection, tables=[
+        models.User.__table__,
+        models.Content.__table__,
+        models.Analytics.__table__,
+    ])
+
+
+def _add_keyset_indexes(connection):
+    """
+    Add (created_at, id) indexes used by keyset pagination
+    """
+    for model in (models.User, models.Content, models.Analytics):
+        for index in model.__table__.indexes:
+            if index.name.endswith("_created_at_id"):
+                index.create(bind=connection, checkfirst=True)
+
+
+def _convert_profile_fields_to_json(connection):
+    """
+    Rewrite stringified profile lists as JSON and switch the columns to JSONB on Postgres
+    """
+    # Untyped columns so values are read back exactly as stored
+    users = table("users", column("id"), *[column(field) for field in PROFILE_LIST_FIELDS])
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(users).where(users.c.id > last_id).order_by(users.c.id).limit(1000)
+        ).mappings().all()
+        if not rows:
+            break
+        for row in rows:
+            changes = {}
+            for field in PROFILE_LIST_FIELDS:
+                value = row[field]
+                if isinstance(value, str):
+                    parsed = parse_profile_field(value, string_items=field in STRING_LIST_FIELDS)
+                    if json.dumps(parsed) != value:
+                        changes[field] = json.dumps(parsed)
+            if changes:
+                connection.execute(users.update().where(users.c.id == row["id"]).values(**changes))
+        last_id = rows[-1]["id"]
+
+    if connection.dialect.name == "postgresql":
+        column_types = {col["name"]: str(col["type"]).upper() for col in inspect(connection).get_columns("users")}
+        for field in PROFILE_LIST_FIELDS:
+            if column_types.get(field) != "JSONB":
+                connection.execute(text(f"ALTER TABLE users ALTER COLUMN {field} TYPE JSONB USING {field}::jsonb"))
+        # GIN indexes serve "users with skill/interest X" containment queries
+        for field in STRING_LIST_FIELDS:
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_users_{field}_gin ON users USING gin ({field} jsonb_path_ops)"
+            ))
+
+
+def _create_analytics_snapshots(connection):
+    """
+    Create the append-only analytics_snapshots table and seed it from analytics
+    """
+    # Also creates the latest-snapshot view and, on Postgres, the default partition
+    Base.metadata.create_all(bind=connection, tables=[models.AnalyticsSnapshot.__table__])
+
+    analytics = models.Analytics.__table__
+    oldest = connection.execute(select(func.min(analytics.c.created_at))).scalar()
+    snapshots.ensure_partitions(connection, start=oldest)
+
+    rows = connection.execute(
+        select(
+            analytics.c.content_id,
+            *[analytics.c[field] for field in snapshots.METRIC_FIELDS],
+            func.coalesce(analytics.c.updated_at, analytics.c.created_at).label("captured_at"),
+        ).where(analytics.c.content_id.isnot(None))
+    ).mappings().all()
+    snapshots.record_snapshots(connection, [dict(row) for row in rows])
+
+
+# Ordered list of (version, description, upgrade function). Each upgrade runs
+# in its own transaction and must be safe on databases created by create_all.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "initial schema", _create_initial_tables),
+    (2, "keyset pagination indexes", _add_keyset_indexes),
+    (3, "JSON profile fields", _convert_profile_fields_to_json),
+    (4, "analytics snapshots", _create_analytics_snapshots),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(engine) -> int:
+    """
+    Get the schema version recorded in the database (0 if never migrated)
+    """
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(schema_version.name):
+            return 0
+        version = connection.execute(select(func.max(schema_version.c.version))).scalar()
+    return version or 0
+
+
+def upgrade(engine, target: int = LATEST_VERSION) -> List[int]:
+    """
+    Apply all pending migrations up to the target version
+    """
+    migration_metadata.create_all(bind=engine)
+    applied = []
+    version = current_version(engine)
+
+    for migration_version, description, migrate in MIGRATIONS:
+        if migration_version <= version or migration_version > target:
+            continue
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(schema_version.insert().values(
+                version=migration_version, description=description
+            ))
+        applied.append(migration_version)
+
+    return applied
+
+
+def check_schema(engine) -> int:
+    """
+    Verify the database schema is up to date without modifying it
+    """
+    version = current_version(engine)
+    if version < LATEST_VERSION:
+        raise SchemaVersionError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}. "
+            "Run 'python -m backend.init_db' to apply pending migrations."
+        )
+    return version
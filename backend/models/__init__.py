@@ -1,3 +1,3 @@
 from .user import User
 from .content import Content
-from .analytics import Analytics
\ No newline at end of file
+from .analytics import Analytics, AnalyticsSnapshot
\ No newline at end of file
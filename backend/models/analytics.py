@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index, MetaData, Table, DDL, event
 from sqlalchemy.sql import func
 from ..database import Base
 
 class Analytics(Base):
     __tablename__ = "analytics"
+    __table_args__ = (Index("ix_analytics_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     content_id = Column(Integer, ForeignKey("content.id"))
@@ -14,4 +15,46 @@ class Analytics(Base):
     engagement_rate = Column(Integer, default=0)
     reach = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class AnalyticsSnapshot(Base):
+    """
+    Append-only engagement metrics captured for a piece of content
+
+    On Postgres the table is range-partitioned by month on captured_at
+    (see backend/snapshots.py); rows that fall outside the monthly
+    partitions land in the default partition.
+    """
+    __tablename__ = "analytics_snapshots"
+    __table_args__ = {"postgresql_partition_by": "RANGE (captured_at)"}
+
+    content_id = Column(Integer, ForeignKey("content.id"), primary_key=True)
+    captured_at = Column(DateTime(timezone=True), primary_key=True)
+    likes = Column(Integer, default=0)
+    comments = Column(Integer, default=0)
+    shares = Column(Integer, default=0)
+    impressions = Column(Integer, default=0)
+    engagement_rate = Column(Integer, default=0)
+    reach = Column(Integer, default=0)
+
+
+# Most recent snapshot per content, maintained as a database view
+analytics_latest = Table(
+    "analytics_latest",
+    MetaData(),
+    *[Column(column.name, column.type, primary_key=column.primary_key) for column in AnalyticsSnapshot.__table__.columns]
+)
+
+event.listen(AnalyticsSnapshot.__table__, "after_create", DDL(
+    "CREATE TABLE IF NOT EXISTS analytics_snapshots_default PARTITION OF analytics_snapshots DEFAULT"
+).execute_if(dialect="postgresql"))
+event.listen(AnalyticsSnapshot.__table__, "after_create", DDL(
+    "CREATE OR REPLACE VIEW analytics_latest AS "
+    "SELECT DISTINCT ON (content_id) * FROM analytics_snapshots ORDER BY content_id, captured_at DESC"
+).execute_if(dialect="postgresql"))
+event.listen(AnalyticsSnapshot.__table__, "after_create", DDL(
+    "CREATE VIEW IF NOT EXISTS analytics_latest AS "
+    "SELECT * FROM analytics_snapshots AS s WHERE s.captured_at = "
+    "(SELECT MAX(captured_at) FROM analytics_snapshots WHERE content_id = s.content_id)"
+).execute_if(dialect="sqlite"))
+event.listen(AnalyticsSnapshot.__table__, "before_drop", DDL("DROP VIEW IF EXISTS analytics_latest"))
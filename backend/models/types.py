@@ -0,0 +1,42 @@
+from sqlalchemy import JSON, Boolean
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import functions
+from sqlalchemy.sql.functions import FunctionElement
+
+# JSON column stored as JSONB on Postgres (indexable with GIN) and JSON text elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class json_array_contains(FunctionElement):
+    """
+    True when a JSON array column contains the given scalar value
+
+    Renders as a JSONB containment test on Postgres so GIN indexes are used,
+    and as a json_each lookup on SQLite.
+    """
+    type = Boolean()
+    name = "json_array_contains"
+    inherit_cache = True
+
+
+@compiles(json_array_contains, "postgresql")
+def _json_array_contains_postgresql(element, compiler, **kw):
+    column, value = list(element.clauses)
+    return "%s @> jsonb_build_array(CAST(%s AS TEXT))" % (
+        compiler.process(column, **kw), compiler.process(value, **kw)
+    )
+
+
+@compiles(json_array_contains, "sqlite")
+def _json_array_contains_sqlite(element, compiler, **kw):
+    column, value = list(element.clauses)
+    return "EXISTS (SELECT 1 FROM json_each(%s) WHERE json_each.value = %s)" % (
+        compiler.process(column, **kw), compiler.process(value, **kw)
+    )
+
+
+@compiles(functions.now, "sqlite")
+def _now_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP only has one-second resolution, too coarse for row versions
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
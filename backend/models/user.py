@@ -1,18 +1,20 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
 from sqlalchemy.sql import func
 from ..database import Base
+from .types import JSONType
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     linkedin_profile_url = Column(String, unique=True, index=True)
     name = Column(String)
     headline = Column(String)
     about = Column(Text)
-    skills = Column(Text)  # JSON string of skills
-    experience = Column(Text)  # JSON string of experience
-    education = Column(Text)  # JSON string of education
-    interests = Column(Text)  # JSON string of interests
+    skills = Column(JSONType)  # list of skill names
+    experience = Column(JSONType)  # list of positions
+    education = Column(JSONType)  # list of degrees
+    interests = Column(JSONType)  # list of interests
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
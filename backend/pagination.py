@@ -0,0 +1,75 @@
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from typing import Any, List, Optional, Tuple
+import base64
+import json
+
+# Supported keyset orderings; a leading "-" means descending
+ORDERINGS = ("id", "-id", "created_at", "-created_at")
+
+
+def encode_cursor(order_by: str, row: Any) -> str:
+    """
+    Encode the last row on a page as an opaque cursor
+    """
+    payload = json.dumps({"o": order_by, "id": row.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor for the same ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["o"] != order_by:
+            raise ValueError("cursor ordering mismatch")
+        return int(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def ordering(model, order_by: str) -> List[Any]:
+    """
+    Get the ORDER BY clauses for a keyset ordering, with id as the tiebreaker
+    """
+    if order_by not in ORDERINGS:
+        raise HTTPException(status_code=400, detail=f"order_by must be one of {', '.join(ORDERINGS)}")
+    columns = [model.created_at, model.id] if order_by.lstrip("-") == "created_at" else [model.id]
+    return [column.desc() if order_by.startswith("-") else column.asc() for column in columns]
+
+
+def keyset_select(model, order_by: str = "id", cursor: Optional[str] = None, limit: int = 100):
+    """
+    Build a SELECT for one page that seeks past the cursor instead of using OFFSET
+
+    For created_at orderings the anchor row's timestamp is read back from the
+    table by primary key, so the comparison always uses the stored value.
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    order_clauses = ordering(model, order_by)
+    descending = order_by.startswith("-")
+    by_created_at = order_by.lstrip("-") == "created_at"
+    query = select(model)
+
+    if cursor:
+        anchor_id = decode_cursor(cursor, order_by)
+        if by_created_at:
+            anchor_created_at = select(model.created_at).where(model.id == anchor_id).scalar_subquery()
+            position, anchor = tuple_(model.created_at, model.id), tuple_(anchor_created_at, anchor_id)
+        else:
+            position, anchor = model.id, anchor_id
+        query = query.where(position < anchor if descending else position > anchor)
+
+    return query.order_by(*order_clauses).limit(limit + 1)
+
+
+def paginate(rows: List[Any], order_by: str, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    Trim the look-ahead row and compute the cursor for the next page
+    """
+    if len(rows) <= limit:
+        return rows, None
+    items = rows[:limit]
+    return items, encode_cursor(order_by, items[-1])
@@ -0,0 +1,38 @@
+from sqlalchemy import select, update
+from typing import Any, Dict, Optional
+
+
+def supports_update_returning(dialect) -> bool:
+    """
+    Check whether a dialect can return rows from an UPDATE statement
+    """
+    # SQLAlchemy 1.4 calls this full_returning; 2.0 renamed it update_returning
+    return bool(getattr(dialect, "update_returning", getattr(dialect, "full_returning", False)))
+
+
+def patch_row(db, model, row_id: int, values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Update only the given fields of one row and return the updated row
+
+    Issues a single UPDATE ... RETURNING where the database supports it and
+    otherwise an UPDATE followed by a SELECT in the same transaction. Returns
+    None when no row has the given id.
+    """
+    table = model.__table__
+
+    if not values:
+        row = db.execute(select(table).where(table.c.id == row_id)).mappings().first()
+        return dict(row) if row is not None else None
+
+    statement = update(table).where(table.c.id == row_id).values(**values)
+
+    if supports_update_returning(db.get_bind().dialect):
+        row = db.execute(statement.returning(*table.c)).mappings().first()
+    else:
+        result = db.execute(statement)
+        row = None
+        if result.rowcount:
+            row = db.execute(select(table).where(table.c.id == row_id)).mappings().first()
+
+    db.commit()
+    return dict(row) if row is not None else None
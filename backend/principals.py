@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from sqlalchemy import inspect
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds a verified token's user is reused before it is read again (never past the token's exp)
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+
+
+class Principal(SimpleNamespace):
+    """
+    Detached copy of a user's column values, shared by requests using the same token
+    """
+
+
+def principal_of(user: Any) -> Principal:
+    return Principal(**{attr.key: getattr(user, attr.key) for attr in inspect(user).mapper.column_attrs})
+
+
+class PrincipalCache:
+    """
+    In-process LRU cache of verified token -> principal
+
+    Entries expire after the TTL or at the token's exp, whichever is first.
+    Logged-out tokens are remembered until their exp so they are not verified
+    again. Each worker keeps its own cache, so an update made through another
+    worker is picked up within the TTL.
+    """
+
+    def __init__(self, max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES, ttl: int = PRINCIPAL_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._tokens_by_user: Dict[Any, set] = {}
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.invalidations = 0
+
+    def _remove(self, token: str):
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None and entry[1] <= time.time():
+                self._remove(token)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, principal: Principal, expires_at: Optional[float] = None):
+        """
+        Cache the principal for a verified token until the TTL or expires_at (epoch seconds)
+        """
+        now = time.time()
+        expires_at = min(now + self.ttl, expires_at or float("inf"))
+        with self._lock:
+            if expires_at <= now or token in self._revoked:
+                return
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (principal, expires_at)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: Any):
+        """
+        Drop every cached token of a user, e.g. after the user is updated
+        """
+        with self._lock:
+            tokens = list(self._tokens_by_user.get(user_id, ()))
+            for token in tokens:
+                self._remove(token)
+            self.invalidations += len(tokens)
+
+    def revoke(self, token: str, expires_at: float):
+        """
+        Drop a token and reject it until it expires
+        """
+        now = time.time()
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+                self.invalidations += 1
+            self._revoked = {key: expiry for key, expiry in self._revoked.items() if expiry > now}
+            self._revoked[token] = expires_at
+
+    def is_revoked(self, token: str) -> bool:
+        expires_at = self._revoked.get(token)
+        return expires_at is not None and expires_at > time.time()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+            self._revoked.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "revoked": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache()
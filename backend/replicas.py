@@ -0,0 +1,120 @@
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from typing import Any, Callable, Dict, List, Optional
+import itertools
+import threading
+import time
+
+# Postgres standby lag; 0 on a primary or when all received WAL has been replayed
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+def replication_lag(engine) -> float:
+    """
+    Measure how many seconds a replica is behind its primary
+    """
+    if engine.dialect.name != "postgresql":
+        # SQLite and other local setups have no replication stream to measure
+        with engine.connect():
+            return 0.0
+    with engine.connect() as connection:
+        lag = connection.execute(POSTGRES_LAG_QUERY).scalar()
+    return float(lag or 0)
+
+
+class Replica:
+    """
+    A read replica engine with its session factory and routing state
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.async_session_factory = None
+        self.lag: Optional[float] = None
+        self.healthy = True
+        self.active = 0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "url": self.engine.url.render_as_string(hide_password=True),
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "active_sessions": self.active,
+        }
+
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only sessions
+
+    Replicas that are unreachable or lag more than max_lag seconds are skipped
+    until the next lag check; among the rest the one with the fewest open
+    sessions wins, with ties rotated round-robin.
+    """
+
+    def __init__(self, engines: List[Any], max_lag: float = 5.0, check_interval: float = 5.0,
+                 lag_probe: Callable[[Any], float] = replication_lag):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._rotation = itertools.count()
+        self._checked_at = None
+
+    def needs_refresh(self) -> bool:
+        return self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval
+
+    def refresh(self):
+        """
+        Re-measure replica health and lag, unless another thread is already doing it
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            for replica in self.replicas:
+                try:
+                    replica.lag = self.lag_probe(replica.engine)
+                    replica.healthy = True
+                except Exception:
+                    replica.lag = None
+                    replica.healthy = False
+            self._checked_at = time.monotonic()
+        finally:
+            self._refresh_lock.release()
+
+    def choose(self, refresh: bool = True) -> Optional[Replica]:
+        """
+        Reserve the least busy eligible replica, or return None to use the primary
+        """
+        if not self.replicas:
+            return None
+        if refresh and self.needs_refresh():
+            self.refresh()
+
+        candidates = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.lag is not None and replica.lag <= self.max_lag
+        ]
+        if not candidates:
+            return None
+
+        with self._lock:
+            start = next(self._rotation) % len(candidates)
+            rotated = candidates[start:] + candidates[:start]
+            replica = min(rotated, key=lambda candidate: candidate.active)
+            replica.active += 1
+        return replica
+
+    def release(self, replica: Replica):
+        with self._lock:
+            replica.active -= 1
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [replica.status() for replica in self.replicas]
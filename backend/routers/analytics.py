@@ -1,47 +1,122 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from .. import schemas, models, database
+from .. import schemas, models, database, pagination, patching, bulk, snapshots, cache, conditional
 
 router = APIRouter()
 
+def _content_ids_of(db: Session, analytics_ids: List[Any]) -> List[int]:
+    """
+    Get the content ids currently referenced by the given analytics rows
+    """
+    analytics_ids = [analytics_id for analytics_id in analytics_ids if isinstance(analytics_id, int)]
+    if not analytics_ids:
+        return []
+    return db.execute(
+        select(models.Analytics.content_id).where(models.Analytics.id.in_(analytics_ids))
+    ).scalars().all()
+
 @router.post("/", response_model=schemas.Analytics, status_code=status.HTTP_201_CREATED)
 def create_analytics(analytics: schemas.AnalyticsCreate, db: Session = Depends(database.get_db)):
     db_analytics = models.Analytics(**analytics.dict())
     db.add(db_analytics)
+    snapshots.record_snapshots(db, [analytics.dict()])
     db.commit()
     db.refresh(db_analytics)
+    cache.response_cache.invalidate(cache.content_analytics_key(analytics.content_id))
     return db_analytics
 
+@router.post("/bulk", response_model=schemas.BulkResult)
+def bulk_write_analytics(items: List[Dict[str, Any]], db: Session = Depends(database.get_db)):
+    previous_content_ids = _content_ids_of(db, [item.get("id") for item in items])
+    result = bulk.bulk_write(db, models.Analytics, schemas.AnalyticsCreate, items, parent=("content_id", models.Content),
+                             on_write=snapshots.record_snapshots)
+    content_ids = previous_content_ids + [item.get("content_id") for item in items]
+    cache.response_cache.invalidate(*cache.keys_for(cache.content_analytics_key, content_ids))
+    return result
+
+@router.post("/snapshots", response_model=schemas.AnalyticsSnapshotResult, status_code=status.HTTP_201_CREATED)
+def record_analytics_snapshots(items: List[schemas.AnalyticsSnapshotCreate], db: Session = Depends(database.get_db)):
+    return {"created": snapshots.append_snapshots(db, [item.dict() for item in items])}
+
+@router.get("/latest", response_model=List[schemas.AnalyticsSnapshot])
+def get_latest_snapshots(content_id: Optional[List[int]] = Query(None), skip: int = 0, limit: int = 100, db: Session = Depends(database.get_read_db)):
+    return db.execute(snapshots.latest_select(content_id, skip, limit)).mappings().all()
+
+@router.get("/page", response_model=schemas.AnalyticsPage)
+def get_analytics_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: Session = Depends(database.get_read_db)):
+    query = pagination.keyset_select(models.Analytics, order_by, cursor, limit)
+    not_modified = conditional.precheck_query(db, request, response, models.Analytics, query)
+    if not_modified is not None:
+        return not_modified
+    rows = db.execute(query).scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.Analytics, rows), {"items": items, "next_cursor": next_cursor})
+
 @router.get("/{analytics_id}", response_model=schemas.Analytics)
-def get_analytics(analytics_id: int, db: Session = Depends(database.get_db)):
+def get_analytics(analytics_id: int, request: Request, response: Response, db: Session = Depends(database.get_read_db)):
+    not_modified = conditional.precheck_row(db, request, response, models.Analytics, models.Analytics.id == analytics_id)
+    if not_modified is not None:
+        return not_modified
     db_analytics = db.query(models.Analytics).filter(models.Analytics.id == analytics_id).first()
     if db_analytics is None:
         raise HTTPException(status_code=404, detail="Analytics not found")
-    return db_analytics
+    return conditional.respond(request, response, conditional.version_of(models.Analytics, db_analytics), db_analytics)
 
 @router.put("/{analytics_id}", response_model=schemas.Analytics)
 def update_analytics(analytics_id: int, analytics: schemas.AnalyticsUpdate, db: Session = Depends(database.get_db)):
     db_analytics = db.query(models.Analytics).filter(models.Analytics.id == analytics_id).first()
     if db_analytics is None:
         raise HTTPException(status_code=404, detail="Analytics not found")
+    previous_content_id = db_analytics.content_id
     
     for key, value in analytics.dict().items():
         setattr(db_analytics, key, value)
+    snapshots.record_snapshots(db, [analytics.dict()])
     
     db.commit()
     db.refresh(db_analytics)
+    cache.response_cache.invalidate(*cache.keys_for(cache.content_analytics_key, [previous_content_id, analytics.content_id]))
+    return db_analytics
+
+@router.patch("/{analytics_id}", response_model=schemas.Analytics)
+def patch_analytics(analytics_id: int, analytics: schemas.AnalyticsPatch, db: Session = Depends(database.get_db)):
+    values = analytics.dict(exclude_unset=True)
+    previous_content_ids = _content_ids_of(db, [analytics_id]) if "content_id" in values else []
+    db_analytics = patching.patch_row(db, models.Analytics, analytics_id, values)
+    if db_analytics is None:
+        raise HTTPException(status_code=404, detail="Analytics not found")
+    snapshots.record_snapshots(db, [db_analytics])
+    db.commit()
+    cache.response_cache.invalidate(*cache.keys_for(cache.content_analytics_key, previous_content_ids + [db_analytics["content_id"]]))
     return db_analytics
 
 @router.get("/", response_model=List[schemas.Analytics])
-def get_analytics_list(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    analytics = db.query(models.Analytics).offset(skip).limit(limit).all()
-    return analytics
+def get_analytics_list(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(database.get_read_db)):
+    query = select(models.Analytics).offset(skip).limit(limit)
+    not_modified = conditional.precheck_query(db, request, response, models.Analytics, query)
+    if not_modified is not None:
+        return not_modified
+    analytics = db.execute(query).scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Analytics, analytics), analytics)
 
 @router.get("/content/{content_id}", response_model=schemas.Analytics)
-def get_content_analytics(content_id: int, db: Session = Depends(database.get_db)):
-    analytics = db.query(models.Analytics).filter(models.Analytics.content_id == content_id).first()
+def get_content_analytics(content_id: int, request: Request, response: Response, db: Session = Depends(database.get_read_db)):
+    analytics = cache.response_cache.get(cache.content_analytics_key(content_id))
     if analytics is None:
-        raise HTTPException(status_code=404, detail="Analytics not found for this content")
-    return analytics
\ No newline at end of file
+        not_modified = conditional.precheck_row(db, request, response, models.Analytics, models.Analytics.content_id == content_id)
+        if not_modified is not None:
+            return not_modified
+        db_analytics = db.query(models.Analytics).filter(models.Analytics.content_id == content_id).order_by(models.Analytics.id).first()
+        if db_analytics is None:
+            raise HTTPException(status_code=404, detail="Analytics not found for this content")
+        analytics = cache.response_cache.set(cache.content_analytics_key(content_id), cache.serialize(db_analytics))
+    return conditional.respond(request, response, conditional.version_of(models.Analytics, analytics), analytics)
+
+@router.get("/content/{content_id}/history", response_model=List[schemas.AnalyticsSnapshot])
+def get_content_analytics_history(content_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                                  limit: int = 1000, db: Session = Depends(database.get_read_db)):
+    return db.execute(snapshots.history_select(content_id, since, until, limit)).scalars().all()
\ No newline at end of file
@@ -0,0 +1,130 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+
+from .. import schemas, models, database, pagination, patching, bulk, snapshots, cache, conditional
+
+router = APIRouter()
+
+async def _content_ids_of(db: AsyncSession, analytics_ids: List[Any]) -> List[int]:
+    """
+    Get the content ids currently referenced by the given analytics rows
+    """
+    analytics_ids = [analytics_id for analytics_id in analytics_ids if isinstance(analytics_id, int)]
+    if not analytics_ids:
+        return []
+    result = await db.execute(
+        select(models.Analytics.content_id).where(models.Analytics.id.in_(analytics_ids))
+    )
+    return result.scalars().all()
+
+@router.post("/", response_model=schemas.Analytics, status_code=status.HTTP_201_CREATED)
+async def create_analytics(analytics: schemas.AnalyticsCreate, db: AsyncSession = Depends(database.async_get_db)):
+    db_analytics = models.Analytics(**analytics.dict())
+    db.add(db_analytics)
+    await db.run_sync(snapshots.record_snapshots, [analytics.dict()])
+    await db.commit()
+    await db.refresh(db_analytics)
+    await cache.response_cache.ainvalidate(cache.content_analytics_key(analytics.content_id))
+    return db_analytics
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+async def bulk_write_analytics(items: List[Dict[str, Any]], db: AsyncSession = Depends(database.async_get_db)):
+    previous_content_ids = await _content_ids_of(db, [item.get("id") for item in items])
+    result = await db.run_sync(bulk.bulk_write, models.Analytics, schemas.AnalyticsCreate, items, ("content_id", models.Content),
+                               on_write=snapshots.record_snapshots)
+    content_ids = previous_content_ids + [item.get("content_id") for item in items]
+    await cache.response_cache.ainvalidate(*cache.keys_for(cache.content_analytics_key, content_ids))
+    return result
+
+@router.post("/snapshots", response_model=schemas.AnalyticsSnapshotResult, status_code=status.HTTP_201_CREATED)
+async def record_analytics_snapshots(items: List[schemas.AnalyticsSnapshotCreate], db: AsyncSession = Depends(database.async_get_db)):
+    return {"created": await db.run_sync(snapshots.append_snapshots, [item.dict() for item in items])}
+
+@router.get("/latest", response_model=List[schemas.AnalyticsSnapshot])
+async def get_latest_snapshots(content_id: Optional[List[int]] = Query(None), skip: int = 0, limit: int = 100, db: AsyncSession = Depends(database.async_get_read_db)):
+    result = await db.execute(snapshots.latest_select(content_id, skip, limit))
+    return result.mappings().all()
+
+@router.get("/page", response_model=schemas.AnalyticsPage)
+async def get_analytics_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: AsyncSession = Depends(database.async_get_read_db)):
+    query = pagination.keyset_select(models.Analytics, order_by, cursor, limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.Analytics, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    rows = result.scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.Analytics, rows), {"items": items, "next_cursor": next_cursor})
+
+@router.get("/{analytics_id}", response_model=schemas.Analytics)
+async def get_analytics(analytics_id: int, request: Request, response: Response, db: AsyncSession = Depends(database.async_get_read_db)):
+    not_modified = await db.run_sync(conditional.precheck_row, request, response, models.Analytics, models.Analytics.id == analytics_id)
+    if not_modified is not None:
+        return not_modified
+    db_analytics = await db.get(models.Analytics, analytics_id)
+    if db_analytics is None:
+        raise HTTPException(status_code=404, detail="Analytics not found")
+    return conditional.respond(request, response, conditional.version_of(models.Analytics, db_analytics), db_analytics)
+
+@router.put("/{analytics_id}", response_model=schemas.Analytics)
+async def update_analytics(analytics_id: int, analytics: schemas.AnalyticsUpdate, db: AsyncSession = Depends(database.async_get_db)):
+    db_analytics = await db.get(models.Analytics, analytics_id)
+    if db_analytics is None:
+        raise HTTPException(status_code=404, detail="Analytics not found")
+    previous_content_id = db_analytics.content_id
+    
+    for key, value in analytics.dict().items():
+        setattr(db_analytics, key, value)
+    await db.run_sync(snapshots.record_snapshots, [analytics.dict()])
+    
+    await db.commit()
+    await db.refresh(db_analytics)
+    await cache.response_cache.ainvalidate(*cache.keys_for(cache.content_analytics_key, [previous_content_id, analytics.content_id]))
+    return db_analytics
+
+@router.patch("/{analytics_id}", response_model=schemas.Analytics)
+async def patch_analytics(analytics_id: int, analytics: schemas.AnalyticsPatch, db: AsyncSession = Depends(database.async_get_db)):
+    values = analytics.dict(exclude_unset=True)
+    previous_content_ids = await _content_ids_of(db, [analytics_id]) if "content_id" in values else []
+    db_analytics = await db.run_sync(patching.patch_row, models.Analytics, analytics_id, values)
+    if db_analytics is None:
+        raise HTTPException(status_code=404, detail="Analytics not found")
+    await db.run_sync(snapshots.record_snapshots, [db_analytics])
+    await db.commit()
+    await cache.response_cache.ainvalidate(*cache.keys_for(cache.content_analytics_key, previous_content_ids + [db_analytics["content_id"]]))
+    return db_analytics
+
+@router.get("/", response_model=List[schemas.Analytics])
+async def get_analytics_list(request: Request, response: Response, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(database.async_get_read_db)):
+    query = select(models.Analytics).offset(skip).limit(limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.Analytics, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    analytics = result.scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Analytics, analytics), analytics)
+
+@router.get("/content/{content_id}", response_model=schemas.Analytics)
+async def get_content_analytics(content_id: int, request: Request, response: Response, db: AsyncSession = Depends(database.async_get_read_db)):
+    analytics = await cache.response_cache.aget(cache.content_analytics_key(content_id))
+    if analytics is None:
+        not_modified = await db.run_sync(conditional.precheck_row, request, response, models.Analytics, models.Analytics.content_id == content_id)
+        if not_modified is not None:
+            return not_modified
+        result = await db.execute(
+            select(models.Analytics).filter(models.Analytics.content_id == content_id).order_by(models.Analytics.id).limit(1)
+        )
+        db_analytics = result.scalars().first()
+        if db_analytics is None:
+            raise HTTPException(status_code=404, detail="Analytics not found for this content")
+        analytics = await cache.response_cache.aset(cache.content_analytics_key(content_id), cache.serialize(db_analytics))
+    return conditional.respond(request, response, conditional.version_of(models.Analytics, analytics), analytics)
+
+@router.get("/content/{content_id}/history", response_model=List[schemas.AnalyticsSnapshot])
+async def get_content_analytics_history(content_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                                        limit: int = 1000, db: AsyncSession = Depends(database.async_get_read_db)):
+    result = await db.execute(snapshots.history_select(content_id, since, until, limit))
+    return result.scalars().all()
\ No newline at end of file
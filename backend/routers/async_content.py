@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
+
+from .. import schemas, models, database, pagination, patching, bulk, cache, conditional, batch
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.Content, status_code=status.HTTP_201_CREATED)
+async def create_content(content: schemas.ContentCreate, db: AsyncSession = Depends(database.async_get_db)):
+    db_content = models.Content(**content.dict())
+    db.add(db_content)
+    await db.commit()
+    await db.refresh(db_content)
+    return db_content
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+async def bulk_write_content(items: List[Dict[str, Any]], db: AsyncSession = Depends(database.async_get_db)):
+    result = await db.run_sync(bulk.bulk_write, models.Content, schemas.ContentCreate, items, ("user_id", models.User))
+    await cache.response_cache.ainvalidate(*cache.keys_for(cache.content_key, bulk.updated_ids(result)))
+    return result
+
+@router.post("/generate/batch")
+async def generate_content_batch(request: Request, persist: bool = False, fresh: bool = False, db: AsyncSession = Depends(database.async_get_db)):
+    """
+    Generate content for many (user_id, topic, content_type) items, streaming NDJSON results as they complete
+    """
+    items = await batch.request_items(request)
+    # The stream outlives the request's session, so each step opens its own
+    bind = db.bind
+
+    async def load_user(user_id):
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            user = await session.get(models.User, user_id)
+            return cache.serialize(user) if user is not None else None
+
+    async def store(values):
+        async with AsyncSession(bind, expire_on_commit=False) as session:
+            db_content = models.Content(**values)
+            session.add(db_content)
+            await session.commit()
+            return db_content.id
+
+    return StreamingResponse(
+        batch.generate_batch(items, load_user, store if persist else None, fresh=fresh),
+        media_type=batch.NDJSON_MEDIA_TYPE,
+    )
+
+@router.get("/page", response_model=schemas.ContentPage)
+async def get_contents_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: AsyncSession = Depends(database.async_get_read_db)):
+    query = pagination.keyset_select(models.Content, order_by, cursor, limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    rows = result.scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.Content, rows), {"items": items, "next_cursor": next_cursor})
+
+@router.get("/{content_id}", response_model=schemas.Content)
+async def get_content(content_id: int, request: Request, response: Response, db: AsyncSession = Depends(database.async_get_read_db)):
+    content = await cache.response_cache.aget(cache.content_key(content_id))
+    if content is None:
+        not_modified = await db.run_sync(conditional.precheck_row, request, response, models.Content, models.Content.id == content_id)
+        if not_modified is not None:
+            return not_modified
+        db_content = await db.get(models.Content, content_id)
+        if db_content is None:
+            raise HTTPException(status_code=404, detail="Content not found")
+        content = await cache.response_cache.aset(cache.content_key(content_id), cache.serialize(db_content))
+    return conditional.respond(request, response, conditional.version_of(models.Content, content), content)
+
+@router.put("/{content_id}", response_model=schemas.Content)
+async def update_content(content_id: int, content: schemas.ContentUpdate, db: AsyncSession = Depends(database.async_get_db)):
+    db_content = await db.get(models.Content, content_id)
+    if db_content is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    
+    for key, value in content.dict().items():
+        setattr(db_content, key, value)
+    
+    await db.commit()
+    await db.refresh(db_content)
+    return await cache.response_cache.aset(cache.content_key(content_id), cache.serialize(db_content))
+
+@router.patch("/{content_id}", response_model=schemas.Content)
+async def patch_content(content_id: int, content: schemas.ContentPatch, db: AsyncSession = Depends(database.async_get_db)):
+    db_content = await db.run_sync(patching.patch_row, models.Content, content_id, content.dict(exclude_unset=True))
+    if db_content is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return await cache.response_cache.aset(cache.content_key(content_id), cache.serialize(db_content))
+
+@router.get("/", response_model=List[schemas.Content])
+async def get_contents(request: Request, response: Response, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(database.async_get_read_db)):
+    query = select(models.Content).offset(skip).limit(limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    contents = result.scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Content, contents), contents)
+
+@router.get("/user/{user_id}", response_model=List[schemas.Content])
+async def get_user_contents(request: Request, response: Response, user_id: int, db: AsyncSession = Depends(database.async_get_read_db)):
+    query = select(models.Content).where(models.Content.user_id == user_id)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    contents = result.scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Content, contents), contents)
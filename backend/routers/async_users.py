@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from .. import schemas, models, database, pagination, patching, cache, conditional, principals
+from ..models.types import json_array_contains
+
+router = APIRouter()
+
+@router.post("/", response_model=schemas.User, status_code=status.HTTP_201_CREATED)
+async def create_user(user: schemas.UserCreate, db: AsyncSession = Depends(database.async_get_db)):
+    db_user = models.User(**user.dict())
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+@router.get("/page", response_model=schemas.UserPage)
+async def get_users_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: AsyncSession = Depends(database.async_get_read_db)):
+    query = pagination.keyset_select(models.User, order_by, cursor, limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.User, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    rows = result.scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.User, rows), {"items": items, "next_cursor": next_cursor})
+
+@router.get("/{user_id}", response_model=schemas.User)
+async def get_user(user_id: int, request: Request, response: Response, db: AsyncSession = Depends(database.async_get_read_db)):
+    user = await cache.response_cache.aget(cache.user_key(user_id))
+    if user is None:
+        not_modified = await db.run_sync(conditional.precheck_row, request, response, models.User, models.User.id == user_id)
+        if not_modified is not None:
+            return not_modified
+        db_user = await db.get(models.User, user_id)
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = await cache.response_cache.aset(cache.user_key(user_id), cache.serialize(db_user))
+    return conditional.respond(request, response, conditional.version_of(models.User, user), user)
+
+@router.put("/{user_id}", response_model=schemas.User)
+async def update_user(user_id: int, user: schemas.UserUpdate, db: AsyncSession = Depends(database.async_get_db)):
+    db_user = await db.get(models.User, user_id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    for key, value in user.dict().items():
+        setattr(db_user, key, value)
+    
+    await db.commit()
+    await db.refresh(db_user)
+    principals.principal_cache.invalidate_user(user_id)
+    # Write through so the next read does not go back to a possibly lagging replica
+    return await cache.response_cache.aset(cache.user_key(user_id), cache.serialize(db_user))
+
+@router.patch("/{user_id}", response_model=schemas.User)
+async def patch_user(user_id: int, user: schemas.UserPatch, db: AsyncSession = Depends(database.async_get_db)):
+    db_user = await db.run_sync(patching.patch_row, models.User, user_id, user.dict(exclude_unset=True))
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    principals.principal_cache.invalidate_user(user_id)
+    return await cache.response_cache.aset(cache.user_key(user_id), cache.serialize(db_user))
+
+@router.get("/", response_model=List[schemas.User])
+async def get_users(request: Request, response: Response, skip: int = 0, limit: int = 100, skill: Optional[str] = None, db: AsyncSession = Depends(database.async_get_read_db)):
+    query = select(models.User)
+    if skill:
+        query = query.where(json_array_contains(models.User.skills, skill))
+    query = query.offset(skip).limit(limit)
+    not_modified = await db.run_sync(conditional.precheck_query, request, response, models.User, query)
+    if not_modified is not None:
+        return not_modified
+    result = await db.execute(query)
+    users = result.scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.User, users), users)
@@ -6,7 +6,7 @@ from typing import Optional
 import hashlib
 import os
 
-from .. import schemas, models, database
+from .. import schemas, models, database, principals
 from ..services import linkedin_service
 
 router = APIRouter()
@@ -37,7 +37,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
     """
     Get the current user from the JWT token
+
+    Verified tokens are cached with their user, so repeat requests skip the
+    JWT decode and the users query (the session never opens a connection).
     """
+    principal = principals.principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     from jose import JWTError, jwt
     
     credentials_exception = HTTPException(
@@ -53,11 +60,15 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if principals.principal_cache.is_revoked(token):
+        raise credentials_exception
     
     user = db.query(models.User).filter(models.User.id == int(user_id)).first()
     if user is None:
         raise credentials_exception
-    return user
+    principal = principals.principal_of(user)
+    principals.principal_cache.put(token, principal, payload.get("exp"))
+    return principal
 
 @router.post("/token", response_model=schemas.Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), 
@@ -114,16 +125,16 @@ async def linkedin_auth(request: Request, db: Session = Depends(database.get_db)
     if not user:
         # Get user profile from LinkedIn
         try:
-            profile_data = linkedin_service.get_user_profile(profile_url)
+            profile_data, _ = linkedin_service.get_cached_profile(profile_url)
             user_data = {
                 "linkedin_profile_url": profile_url,
                 "name": profile_data.get("name", ""),
                 "headline": profile_data.get("headline", ""),
                 "about": profile_data.get("about", ""),
-                "skills": str(profile_data.get("skills", [])),
-                "experience": str(profile_data.get("experience", [])),
-                "education": str(profile_data.get("education", [])),
-                "interests": str(profile_data.get("interests", []))
+                "skills": profile_data.get("skills", []),
+                "experience": profile_data.get("experience", []),
+                "education": profile_data.get("education", []),
+                "interests": profile_data.get("interests", [])
             }
             user = models.User(**user_data)
             db.add(user)
@@ -152,14 +163,12 @@ async def read_users_me(current_user: models.User = Depends(get_current_user)):
     return current_user
 
 @router.post("/logout")
-async def logout(current_user: models.User = Depends(get_current_user)):
+async def logout(token: str = Depends(oauth2_scheme), current_user: models.User = Depends(get_current_user)):
     """
     Logout the current user
-    In a real implementation, you would invalidate the token
+    The token is dropped from the principal cache and rejected until it expires
     """
-    # In a real implementation, you would:
-    # 1. Add the token to a blacklist
-    # 2. Set an expiration time for the token
-    # 3. Return a success message
-    
+    from jose import jwt
+
+    principals.principal_cache.revoke(token, jwt.get_unverified_claims(token)["exp"])
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from .. import schemas, models, database
+from .. import schemas, models, database, pagination, patching, bulk, cache, conditional, batch
 
 router = APIRouter()
 
@@ -14,12 +17,65 @@ def create_content(content: schemas.ContentCreate, db: Session = Depends(databas
     db.refresh(db_content)
     return db_content
 
+@router.post("/bulk", response_model=schemas.BulkResult)
+def bulk_write_content(items: List[Dict[str, Any]], db: Session = Depends(database.get_db)):
+    result = bulk.bulk_write(db, models.Content, schemas.ContentCreate, items, parent=("user_id", models.User))
+    cache.response_cache.invalidate(*cache.keys_for(cache.content_key, bulk.updated_ids(result)))
+    return result
+
+@router.post("/generate/batch")
+async def generate_content_batch(request: Request, persist: bool = False, fresh: bool = False, db: Session = Depends(database.get_db)):
+    """
+    Generate content for many (user_id, topic, content_type) items, streaming NDJSON results as they complete
+    """
+    items = await batch.request_items(request)
+    # The stream outlives the request's session, so each step opens its own
+    engine = db.get_bind()
+
+    def load_user(user_id):
+        with Session(bind=engine) as session:
+            user = session.get(models.User, user_id)
+            return cache.serialize(user) if user is not None else None
+
+    def store(values):
+        with Session(bind=engine) as session:
+            db_content = models.Content(**values)
+            session.add(db_content)
+            session.commit()
+            return db_content.id
+
+    return StreamingResponse(
+        batch.generate_batch(
+            items,
+            lambda user_id: run_in_threadpool(load_user, user_id),
+            (lambda values: run_in_threadpool(store, values)) if persist else None,
+            fresh=fresh,
+        ),
+        media_type=batch.NDJSON_MEDIA_TYPE,
+    )
+
+@router.get("/page", response_model=schemas.ContentPage)
+def get_contents_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: Session = Depends(database.get_read_db)):
+    query = pagination.keyset_select(models.Content, order_by, cursor, limit)
+    not_modified = conditional.precheck_query(db, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    rows = db.execute(query).scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.Content, rows), {"items": items, "next_cursor": next_cursor})
+
 @router.get("/{content_id}", response_model=schemas.Content)
-def get_content(content_id: int, db: Session = Depends(database.get_db)):
-    db_content = db.query(models.Content).filter(models.Content.id == content_id).first()
-    if db_content is None:
-        raise HTTPException(status_code=404, detail="Content not found")
-    return db_content
+def get_content(content_id: int, request: Request, response: Response, db: Session = Depends(database.get_read_db)):
+    content = cache.response_cache.get(cache.content_key(content_id))
+    if content is None:
+        not_modified = conditional.precheck_row(db, request, response, models.Content, models.Content.id == content_id)
+        if not_modified is not None:
+            return not_modified
+        db_content = db.query(models.Content).filter(models.Content.id == content_id).first()
+        if db_content is None:
+            raise HTTPException(status_code=404, detail="Content not found")
+        content = cache.response_cache.set(cache.content_key(content_id), cache.serialize(db_content))
+    return conditional.respond(request, response, conditional.version_of(models.Content, content), content)
 
 @router.put("/{content_id}", response_model=schemas.Content)
 def update_content(content_id: int, content: schemas.ContentUpdate, db: Session = Depends(database.get_db)):
@@ -32,14 +88,29 @@ def update_content(content_id: int, content: schemas.ContentUpdate, db: Session
     
     db.commit()
     db.refresh(db_content)
-    return db_content
+    return cache.response_cache.set(cache.content_key(content_id), cache.serialize(db_content))
+
+@router.patch("/{content_id}", response_model=schemas.Content)
+def patch_content(content_id: int, content: schemas.ContentPatch, db: Session = Depends(database.get_db)):
+    db_content = patching.patch_row(db, models.Content, content_id, content.dict(exclude_unset=True))
+    if db_content is None:
+        raise HTTPException(status_code=404, detail="Content not found")
+    return cache.response_cache.set(cache.content_key(content_id), cache.serialize(db_content))
 
 @router.get("/", response_model=List[schemas.Content])
-def get_contents(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    contents = db.query(models.Content).offset(skip).limit(limit).all()
-    return contents
+def get_contents(request: Request, response: Response, skip: int = 0, limit: int = 100, db: Session = Depends(database.get_read_db)):
+    query = select(models.Content).offset(skip).limit(limit)
+    not_modified = conditional.precheck_query(db, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    contents = db.execute(query).scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Content, contents), contents)
 
 @router.get("/user/{user_id}", response_model=List[schemas.Content])
-def get_user_contents(user_id: int, db: Session = Depends(database.get_db)):
-    contents = db.query(models.Content).filter(models.Content.user_id == user_id).all()
-    return contents
\ No newline at end of file
+def get_user_contents(request: Request, response: Response, user_id: int, db: Session = Depends(database.get_read_db)):
+    query = select(models.Content).where(models.Content.user_id == user_id)
+    not_modified = conditional.precheck_query(db, request, response, models.Content, query)
+    if not_modified is not None:
+        return not_modified
+    contents = db.execute(query).scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.Content, contents), contents)
\ No newline at end of file
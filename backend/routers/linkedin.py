@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from typing import List
 import os
@@ -22,17 +22,27 @@ def authenticate_linkedin(profile_url: str, db: Session = Depends(database.get_d
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/profile/{user_id}")
-def get_linkedin_profile(user_id: int, db: Session = Depends(database.get_db)):
+def get_linkedin_profile(user_id: int, response: Response, db: Session = Depends(database.get_db)):
     """
     Get user's LinkedIn profile information
+    Profiles are cached per URL; the Age header and cache_age_seconds give the copy's age
     """
     try:
         user = db.query(models.User).filter(models.User.id == user_id).first()
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
         
-        profile_data = linkedin_service.get_user_profile(user.linkedin_profile_url)
-        return profile_data
+        profile_url = user.linkedin_profile_url
+        engine = db.get_bind()
+
+        def store(profile):
+            # Background refreshes outlive the request, so this uses its own session
+            with Session(bind=engine) as session:
+                linkedin_service.sync_user_profile(session, profile_url, profile)
+
+        profile_data, age = linkedin_service.get_cached_profile(profile_url, on_fetch=store)
+        response.headers["Age"] = str(int(age))
+        return {**profile_data, "cache_age_seconds": round(age, 1)}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+
+from .. import database, cache, principals, drafts
+
+router = APIRouter()
+
+@router.get("/db")
+def get_database_metrics():
+    """
+    Get connection pool occupancy and checkout wait metrics
+    """
+    return database.get_pool_status()
+
+@router.get("/cache")
+def get_cache_metrics():
+    """
+    Get response cache hit/miss counters
+    """
+    return cache.response_cache.stats()
+
+@router.get("/prompts")
+def get_prompt_cache_metrics():
+    """
+    Get generated content cache and near-duplicate draft hit/miss counters
+    """
+    return {**cache.prompt_cache.stats(), "drafts": drafts.draft_store.stats()}
+
+@router.get("/research")
+def get_research_cache_metrics():
+    """
+    Get industry research cache hit, stale hit and refresh counters
+    """
+    from ..services import industry_research_service
+
+    return industry_research_service.research_cache.stats()
+
+@router.get("/auth")
+def get_auth_metrics():
+    """
+    Get principal cache hit/miss counters
+    """
+    return principals.principal_cache.stats()
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from .. import schemas, models, database
+from .. import schemas, models, database, pagination, patching, cache, conditional, principals
+from ..models.types import json_array_contains
 
 router = APIRouter()
 
@@ -14,12 +16,28 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(database.get_db)
     db.refresh(db_user)
     return db_user
 
+@router.get("/page", response_model=schemas.UserPage)
+def get_users_page(request: Request, response: Response, cursor: Optional[str] = None, limit: int = 100, order_by: str = "id", db: Session = Depends(database.get_read_db)):
+    query = pagination.keyset_select(models.User, order_by, cursor, limit)
+    not_modified = conditional.precheck_query(db, request, response, models.User, query)
+    if not_modified is not None:
+        return not_modified
+    rows = db.execute(query).scalars().all()
+    items, next_cursor = pagination.paginate(rows, order_by, limit)
+    return conditional.respond(request, response, conditional.rows_version(models.User, rows), {"items": items, "next_cursor": next_cursor})
+
 @router.get("/{user_id}", response_model=schemas.User)
-def get_user(user_id: int, db: Session = Depends(database.get_db)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
-    if db_user is None:
-        raise HTTPException(status_code=404, detail="User not found")
-    return db_user
+def get_user(user_id: int, request: Request, response: Response, db: Session = Depends(database.get_read_db)):
+    user = cache.response_cache.get(cache.user_key(user_id))
+    if user is None:
+        not_modified = conditional.precheck_row(db, request, response, models.User, models.User.id == user_id)
+        if not_modified is not None:
+            return not_modified
+        db_user = db.query(models.User).filter(models.User.id == user_id).first()
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        user = cache.response_cache.set(cache.user_key(user_id), cache.serialize(db_user))
+    return conditional.respond(request, response, conditional.version_of(models.User, user), user)
 
 @router.put("/{user_id}", response_model=schemas.User)
 def update_user(user_id: int, user: schemas.UserUpdate, db: Session = Depends(database.get_db)):
@@ -32,9 +50,26 @@ def update_user(user_id: int, user: schemas.UserUpdate, db: Session = Depends(da
     
     db.commit()
     db.refresh(db_user)
-    return db_user
+    principals.principal_cache.invalidate_user(user_id)
+    # Write through so the next read does not go back to a possibly lagging replica
+    return cache.response_cache.set(cache.user_key(user_id), cache.serialize(db_user))
+
+@router.patch("/{user_id}", response_model=schemas.User)
+def patch_user(user_id: int, user: schemas.UserPatch, db: Session = Depends(database.get_db)):
+    db_user = patching.patch_row(db, models.User, user_id, user.dict(exclude_unset=True))
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    principals.principal_cache.invalidate_user(user_id)
+    return cache.response_cache.set(cache.user_key(user_id), cache.serialize(db_user))
 
 @router.get("/", response_model=List[schemas.User])
-def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    users = db.query(models.User).offset(skip).limit(limit).all()
-    return users
\ No newline at end of file
+def get_users(request: Request, response: Response, skip: int = 0, limit: int = 100, skill: Optional[str] = None, db: Session = Depends(database.get_read_db)):
+    query = select(models.User)
+    if skill:
+        query = query.where(json_array_contains(models.User.skills, skill))
+    query = query.offset(skip).limit(limit)
+    not_modified = conditional.precheck_query(db, request, response, models.User, query)
+    if not_modified is not None:
+        return not_modified
+    users = db.execute(query).scalars().all()
+    return conditional.respond(request, response, conditional.rows_version(models.User, users), users)
\ No newline at end of file
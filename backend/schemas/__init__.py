@@ -1,4 +1,6 @@
-from .user import User, UserCreate, UserUpdate, UserBase
-from .content import Content, ContentCreate, ContentUpdate, ContentBase
-from .analytics import Analytics, AnalyticsCreate, AnalyticsUpdate, AnalyticsBase
-from .token import Token, TokenData
\ No newline at end of file
+from .user import User, UserCreate, UserUpdate, UserBase, UserPage, UserPatch
+from .content import Content, ContentCreate, ContentUpdate, ContentBase, ContentPage, ContentPatch
+from .analytics import Analytics, AnalyticsCreate, AnalyticsUpdate, AnalyticsBase, AnalyticsPage, AnalyticsPatch, AnalyticsSnapshot, AnalyticsSnapshotCreate, AnalyticsSnapshotResult
+from .token import Token, TokenData
+from .bulk import BulkItemResult, BulkResult
+from .generation import ContentGenerationItem
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class AnalyticsBase(BaseModel):
@@ -17,10 +17,42 @@ class AnalyticsCreate(AnalyticsBase):
 class AnalyticsUpdate(AnalyticsBase):
     pass
 
+class AnalyticsPatch(BaseModel):
+    content_id: Optional[int] = None
+    likes: Optional[int] = None
+    comments: Optional[int] = None
+    shares: Optional[int] = None
+    impressions: Optional[int] = None
+    engagement_rate: Optional[int] = None
+    reach: Optional[int] = None
+
 class Analytics(AnalyticsBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class AnalyticsPage(BaseModel):
+    items: List[Analytics]
+    next_cursor: Optional[str] = None
+
+class AnalyticsSnapshotCreate(BaseModel):
+    content_id: int
+    likes: Optional[int] = 0
+    comments: Optional[int] = 0
+    shares: Optional[int] = 0
+    impressions: Optional[int] = 0
+    engagement_rate: Optional[int] = 0
+    reach: Optional[int] = 0
+    captured_at: Optional[datetime] = None
+
+class AnalyticsSnapshot(AnalyticsSnapshotCreate):
+    captured_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class AnalyticsSnapshotResult(BaseModel):
+    created: int
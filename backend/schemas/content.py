@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class ContentBase(BaseModel):
@@ -19,10 +19,25 @@ class ContentCreate(ContentBase):
 class ContentUpdate(ContentBase):
     pass
 
+class ContentPatch(BaseModel):
+    user_id: Optional[int] = None
+    title: Optional[str] = None
+    body: Optional[str] = None
+    content_type: Optional[str] = None
+    hashtags: Optional[str] = None
+    scheduled_time: Optional[datetime] = None
+    posted: Optional[bool] = None
+    linkedin_post_id: Optional[str] = None
+    engagement_score: Optional[int] = None
+
 class Content(ContentBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ContentPage(BaseModel):
+    items: List[Content]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+
+class ContentGenerationItem(BaseModel):
+    user_id: int
+    topic: str
+    content_type: str = "text"
@@ -1,16 +1,57 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, validator
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+import ast
+import json
 
-class UserBase(BaseModel):
+# Profile fields holding lists of strings; the others hold lists of objects
+STRING_LIST_FIELDS = ("skills", "interests")
+PROFILE_LIST_FIELDS = ("skills", "experience", "education", "interests")
+
+def parse_profile_field(value: Any, string_items: bool = True) -> Any:
+    """
+    Parse a stored profile field into a list
+
+    Accepts lists, JSON strings, Python list reprs written by older versions
+    and, as a last resort, comma separated text.
+    """
+    if value is None or isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            try:
+                value = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                if string_items:
+                    return [item.strip() for item in text.split(",") if item.strip()]
+                return [{"description": text}]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [value]
+
+class ProfileFieldsMixin(BaseModel):
+    @validator("skills", "interests", pre=True, allow_reuse=True, check_fields=False)
+    def parse_string_lists(cls, value):
+        return parse_profile_field(value, string_items=True)
+
+    @validator("experience", "education", pre=True, allow_reuse=True, check_fields=False)
+    def parse_object_lists(cls, value):
+        return parse_profile_field(value, string_items=False)
+
+class UserBase(ProfileFieldsMixin):
     linkedin_profile_url: str
     name: Optional[str] = None
     headline: Optional[str] = None
     about: Optional[str] = None
-    skills: Optional[str] = None
-    experience: Optional[str] = None
-    education: Optional[str] = None
-    interests: Optional[str] = None
+    skills: Optional[List[str]] = None
+    experience: Optional[List[Dict[str, Any]]] = None
+    education: Optional[List[Dict[str, Any]]] = None
+    interests: Optional[List[str]] = None
 
 class UserCreate(UserBase):
     pass
@@ -18,10 +59,24 @@ class UserCreate(UserBase):
 class UserUpdate(UserBase):
     pass
 
+class UserPatch(ProfileFieldsMixin):
+    linkedin_profile_url: Optional[str] = None
+    name: Optional[str] = None
+    headline: Optional[str] = None
+    about: Optional[str] = None
+    skills: Optional[List[str]] = None
+    experience: Optional[List[Dict[str, Any]]] = None
+    education: Optional[List[Dict[str, Any]]] = None
+    interests: Optional[List[str]] = None
+
 class User(UserBase):
     id: int
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
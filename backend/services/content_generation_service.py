@@ -1,9 +1,12 @@
+import asyncio
 import openai
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import os
 from dotenv import load_dotenv
 
+from .. import cache, drafts
+
 # Load environment variables
 load_dotenv()
 
@@ -38,101 +41,178 @@ def generate_content_prompt(user_profile: Dict[str, Any], topic: str, content_ty
     
     return prompt
 
-def generate_text_content(user_profile: Dict[str, Any], topic: str) -> Dict[str, Any]:
+# Calendar entries generated at once by generate_calendar_content
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+
+# Prompt wording, model parameters and fallback text per content type
+GENERATION_SPECS = {
+    "text": {
+        "prompt_type": "text post",
+        "title": "Insights on {topic}",
+        "fallback": "Couldn't generate content at this time. Here are some thoughts on {topic}...",
+        "params": {"engine": "text-davinci-003", "max_tokens": 300, "temperature": 0.7, "stop": ["\n\n"]},
+    },
+    "carousel": {
+        "prompt_type": "carousel",
+        "title": "Key Points on {topic}",
+        "fallback": "Couldn't generate carousel content at this time. Here are some key points on {topic}...",
+        "params": {"engine": "text-davinci-003", "max_tokens": 800, "temperature": 0.7},
+    },
+    "article": {
+        "prompt_type": "article",
+        "title": "Deep Dive: {topic}",
+        "fallback": "Couldn't generate article content at this time. Here's an introduction to {topic}...",
+        "params": {"engine": "text-davinci-003", "max_tokens": 1500, "temperature": 0.7},
+    },
+}
+
+def _reuse(text: Optional[str], scope: str, topic: Optional[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    if text is not None:
+        return text, {"cached": True}
+    match = drafts.draft_store.find(scope, topic) if topic else None
+    if match is not None:
+        return match.draft, {"cached": True, "similar_topic": match.text, "similarity": match.similarity}
+    return None
+
+def complete_prompt(prompt: str, fresh: bool = False, topic: Optional[str] = None, draft_scope: str = "",
+                    **params) -> Tuple[str, Dict[str, Any]]:
     """
-    Generate text content for a LinkedIn post
+    Complete a prompt, reusing a cached completion for the same prompt and model parameters
+
+    With a topic, a draft generated for a near-identical topic in the same
+    draft_scope is reused as well. Returns the text and cache details for
+    the result. fresh skips both lookups; the new completion still replaces
+    the cached one.
+    """
+    key = cache.prompt_key(prompt, params)
+    scope = cache.prompt_key(draft_scope, params)
+    if not fresh:
+        reused = _reuse(cache.prompt_cache.get(key), scope, topic)
+        if reused is not None:
+            return reused
+    response = openai.Completion.create(prompt=prompt, **params)
+    text = cache.prompt_cache.set(key, response.choices[0].text.strip())
+    if topic:
+        drafts.draft_store.put(scope, topic, text)
+    return text, {"cached": False}
+
+async def acomplete_prompt(prompt: str, fresh: bool = False, topic: Optional[str] = None, draft_scope: str = "",
+                           **params) -> Tuple[str, Dict[str, Any]]:
+    """
+    Async variant of complete_prompt that does not block the event loop
+    """
+    key = cache.prompt_key(prompt, params)
+    scope = cache.prompt_key(draft_scope, params)
+    if not fresh:
+        reused = _reuse(await cache.prompt_cache.aget(key), scope, topic)
+        if reused is not None:
+            return reused
+    response = await openai.Completion.acreate(prompt=prompt, **params)
+    text = await cache.prompt_cache.aset(key, response.choices[0].text.strip())
+    if topic:
+        drafts.draft_store.put(scope, topic, text)
+    return text, {"cached": False}
+
+def _draft_scope(user_profile: Dict[str, Any], content_type: str) -> str:
+    # Drafts are only shared between requests for the same content type and tone
+    return f"{content_type}:{user_profile.get('content_tone', 'Professional and Informative')}"
+
+def _request(user_profile: Dict[str, Any], topic: str, content_type: str, fresh: bool) -> Dict[str, Any]:
+    spec = GENERATION_SPECS[content_type]
+    return {
+        "prompt": generate_content_prompt(user_profile, topic, spec["prompt_type"]),
+        "fresh": fresh,
+        "topic": topic,
+        "draft_scope": _draft_scope(user_profile, content_type),
+        **spec["params"],
+    }
+
+def _result(topic: str, content_type: str, content: str, cache_info: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": GENERATION_SPECS[content_type]["title"].format(topic=topic),
+        "body": content,
+        "content_type": content_type,
+        "status": "generated",
+        **cache_info
+    }
+
+def _error(topic: str, content_type: str, error: Exception) -> Dict[str, Any]:
+    spec = GENERATION_SPECS[content_type]
+    return {
+        "title": spec["title"].format(topic=topic),
+        "body": spec["fallback"].format(topic=topic),
+        "content_type": content_type,
+        "status": "error",
+        "cached": False,
+        "error": str(error)
+    }
+
+def generate_content(user_profile: Dict[str, Any], topic: str, content_type: str, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Generate text, carousel or article content for LinkedIn
+    Identical requests, and near-identical topics, are served from cache unless fresh is set
     """
-    prompt = generate_content_prompt(user_profile, topic, "text post")
-    
     try:
-        response = openai.Completion.create(
-            engine="text-davinci-003",
-            prompt=prompt,
-            max_tokens=300,
-            temperature=0.7,
-            stop=["\n\n"]
-        )
-        
-        content = response.choices[0].text.strip()
-        
-        return {
-            "title": f"Insights on {topic}",
-            "body": content,
-            "content_type": "text",
-            "status": "generated"
-        }
+        return _result(topic, content_type, *complete_prompt(**_request(user_profile, topic, content_type, fresh)))
     except Exception as e:
-        return {
-            "title": f"Insights on {topic}",
-            "body": f"Couldn't generate content at this time. Here are some thoughts on {topic}...",
-            "content_type": "text",
-            "status": "error",
-            "error": str(e)
-        }
+        return _error(topic, content_type, e)
 
-def generate_carousel_content(user_profile: Dict[str, Any], topic: str) -> Dict[str, Any]:
+async def agenerate_content(user_profile: Dict[str, Any], topic: str, content_type: str, fresh: bool = False) -> Dict[str, Any]:
     """
-    Generate carousel content for LinkedIn
+    Async variant of generate_content
     """
-    prompt = generate_content_prompt(user_profile, topic, "carousel")
-    
     try:
-        response = openai.Completion.create(
-            engine="text-davinci-003",
-            prompt=prompt,
-            max_tokens=800,
-            temperature=0.7
-        )
-        
-        content = response.choices[0].text.strip()
-        
-        # In a real implementation, you would parse this into slides
-        # For now, we'll return the raw content
-        return {
-            "title": f"Key Points on {topic}",
-            "body": content,
-            "content_type": "carousel",
-            "status": "generated"
-        }
+        return _result(topic, content_type, *await acomplete_prompt(**_request(user_profile, topic, content_type, fresh)))
     except Exception as e:
-        return {
-            "title": f"Key Points on {topic}",
-            "body": f"Couldn't generate carousel content at this time. Here are some key points on {topic}...",
-            "content_type": "carousel",
-            "status": "error",
-            "error": str(e)
-        }
+        return _error(topic, content_type, e)
+
+def generate_text_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Generate text content for a LinkedIn post
+    """
+    return generate_content(user_profile, topic, "text", fresh)
 
-def generate_article_content(user_profile: Dict[str, Any], topic: str) -> Dict[str, Any]:
+def generate_carousel_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
+    """
+    Generate carousel content for LinkedIn
+    """
+    return generate_content(user_profile, topic, "carousel", fresh)
+
+def generate_article_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
     """
     Generate article content for LinkedIn
     """
-    prompt = generate_content_prompt(user_profile, topic, "article")
-    
-    try:
-        response = openai.Completion.create(
-            engine="text-davinci-003",
-            prompt=prompt,
-            max_tokens=1500,
-            temperature=0.7
-        )
-        
-        content = response.choices[0].text.strip()
-        
-        return {
-            "title": f"Deep Dive: {topic}",
-            "body": content,
-            "content_type": "article",
-            "status": "generated"
-        }
-    except Exception as e:
-        return {
-            "title": f"Deep Dive: {topic}",
-            "body": f"Couldn't generate article content at this time. Here's an introduction to {topic}...",
-            "content_type": "article",
-            "status": "error",
-            "error": str(e)
-        }
+    return generate_content(user_profile, topic, "article", fresh)
+
+async def agenerate_text_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
+    return await agenerate_content(user_profile, topic, "text", fresh)
+
+async def agenerate_carousel_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
+    return await agenerate_content(user_profile, topic, "carousel", fresh)
+
+async def agenerate_article_content(user_profile: Dict[str, Any], topic: str, fresh: bool = False) -> Dict[str, Any]:
+    return await agenerate_content(user_profile, topic, "article", fresh)
+
+async def generate_calendar_content(user_profile: Dict[str, Any], calendar: List[Dict[str, Any]],
+                                    max_concurrency: int = LLM_MAX_CONCURRENCY) -> List[Dict[str, Any]]:
+    """
+    Generate the content for every calendar entry concurrently
+
+    At most max_concurrency completions run at once. Entries keep their
+    order and get a "content" result; failed entries get the usual error
+    result. Preference types such as "case_studies" are written as text posts.
+    """
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def generate(entry: Dict[str, Any]) -> Dict[str, Any]:
+        content_type = entry.get("content_type")
+        async with semaphore:
+            content = await agenerate_content(
+                user_profile, entry["topic"], content_type if content_type in GENERATION_SPECS else "text"
+            )
+        return {**entry, "content": content}
+
+    return list(await asyncio.gather(*(generate(entry) for entry in calendar)))
 
 def generate_content_with_hashtags(content: Dict[str, Any], hashtags: List[str]) -> Dict[str, Any]:
     """
@@ -1,16 +1,31 @@
 import requests
 from typing import Dict, List, Any
 import json
+import os
 
-def get_trending_topics(industry: str, skills: List[str]) -> List[Dict[str, Any]]:
+from ..swr import StaleWhileRevalidateCache
+
+# Seconds each source's results are fresh; older results are served while they refresh
+RESEARCH_TTLS = {
+    "trending_topics": int(os.getenv("RESEARCH_TRENDING_TTL_SECONDS", 3600)),
+    "industry_news": int(os.getenv("RESEARCH_NEWS_TTL_SECONDS", 900)),
+    "competitor_analysis": int(os.getenv("RESEARCH_COMPETITOR_TTL_SECONDS", 24 * 3600)),
+    "industry_hashtags": int(os.getenv("RESEARCH_HASHTAG_TTL_SECONDS", 6 * 3600)),
+}
+
+# Shared by every user in an industry, so one upstream fetch serves them all
+research_cache = StaleWhileRevalidateCache()
+
+@research_cache.cached("trending_topics", RESEARCH_TTLS["trending_topics"])
+def fetch_trending_topics(industry: str) -> List[Dict[str, Any]]:
     """
-    Get trending topics in the user's industry
+    Fetch the industry-wide trending topics
     """
     # This is a placeholder implementation
     # In a real application, you would integrate with news APIs, 
     # social media APIs, or other data sources
     
-    trending_topics = [
+    return [
         {
             "topic": f"Latest trends in {industry}",
             "keywords": [industry.lower(), "trends", "innovation"],
@@ -22,6 +37,12 @@ def get_trending_topics(industry: str, skills: List[str]) -> List[Dict[str, Any]
             "relevance_score": 85
         }
     ]
+
+def get_trending_topics(industry: str, skills: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get trending topics in the user's industry
+    """
+    trending_topics = fetch_trending_topics(industry)
     
     # Add topics based on skills
     for skill in skills[:3]:  # Limit to first 3 skills
@@ -33,6 +54,7 @@ def get_trending_topics(industry: str, skills: List[str]) -> List[Dict[str, Any]
     
     return trending_topics
 
+@research_cache.cached("industry_news", RESEARCH_TTLS["industry_news"])
 def get_industry_news(industry: str) -> List[Dict[str, Any]]:
     """
     Get recent news in the user's industry
@@ -55,6 +77,7 @@ def get_industry_news(industry: str) -> List[Dict[str, Any]]:
         }
     ]
 
+@research_cache.cached("competitor_analysis", RESEARCH_TTLS["competitor_analysis"])
 def get_competitor_analysis(profile_url: str) -> Dict[str, Any]:
     """
     Analyze competitor content strategies
@@ -84,14 +107,21 @@ def get_competitor_analysis(profile_url: str) -> Dict[str, Any]:
         ]
     }
 
-def get_hashtag_suggestions(industry: str, skills: List[str], content_theme: str) -> List[str]:
+@research_cache.cached("industry_hashtags", RESEARCH_TTLS["industry_hashtags"])
+def fetch_industry_hashtags(industry: str) -> List[str]:
     """
-    Get relevant hashtag suggestions for content
+    Fetch the hashtags popular in an industry
     """
     # This is a placeholder implementation
     # In a real application, you would use social media APIs or web scraping
     
-    hashtags = [f"#{industry.replace(' ', '')}", "#professionaldevelopment"]
+    return [f"#{industry.replace(' ', '')}", "#professionaldevelopment"]
+
+def get_hashtag_suggestions(industry: str, skills: List[str], content_theme: str) -> List[str]:
+    """
+    Get relevant hashtag suggestions for content
+    """
+    hashtags = fetch_industry_hashtags(industry)
     
     # Add skill-based hashtags
     for skill in skills[:5]:  # Limit to first 5 skills
@@ -1,6 +1,10 @@
 import os
 import requests
-from typing import Dict, Any
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .. import cache, models, principals
+from ..swr import StaleWhileRevalidateCache
 
 # Note: The actual LinkedIn API integration would require proper setup
 # For this implementation, we'll provide placeholder functions
@@ -42,6 +46,48 @@ def get_user_profile(profile_url: str) -> Dict[str, Any]:
         ]
     }
 
+# Seconds a fetched profile is served without asking LinkedIn again
+LINKEDIN_PROFILE_TTL_SECONDS = int(os.getenv("LINKEDIN_PROFILE_TTL_SECONDS", 3600))
+# Seconds past that a profile is still served while it is refreshed in the background
+LINKEDIN_PROFILE_STALE_SECONDS = int(os.getenv("LINKEDIN_PROFILE_STALE_SECONDS", 7 * 24 * 3600))
+PROFILE_FIELDS = ("name", "headline", "about", "skills", "experience", "education")
+
+profile_cache = StaleWhileRevalidateCache(stale_ttl=LINKEDIN_PROFILE_STALE_SECONDS)
+
+def get_cached_profile(profile_url: str, on_fetch: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Tuple[Dict[str, Any], float]:
+    """
+    Get a user's LinkedIn profile from the cache, and its age in seconds
+
+    Stale profiles are returned at once and refreshed in the background.
+    on_fetch is called with each profile fetched from LinkedIn.
+    """
+    def fetch():
+        profile = get_user_profile(profile_url)
+        if on_fetch is not None:
+            on_fetch(profile)
+        return profile
+
+    return profile_cache.lookup(profile_url, fetch, LINKEDIN_PROFILE_TTL_SECONDS)
+
+def sync_user_profile(db: Session, profile_url: str, profile: Dict[str, Any]) -> List[int]:
+    """
+    Copy a fetched profile onto the user's row, writing only if a field changed
+    """
+    updated = []
+    for user in db.query(models.User).filter(models.User.linkedin_profile_url == profile_url).all():
+        changes = {field: profile[field] for field in PROFILE_FIELDS
+                   if field in profile and getattr(user, field) != profile[field]}
+        if changes:
+            for field, value in changes.items():
+                setattr(user, field, value)
+            updated.append(user.id)
+    if updated:
+        db.commit()
+        cache.response_cache.invalidate(*cache.keys_for(cache.user_key, updated))
+        for user_id in updated:
+            principals.principal_cache.invalidate_user(user_id)
+    return updated
+
 def post_content(content) -> Dict[str, Any]:
     """
     Post content to LinkedIn
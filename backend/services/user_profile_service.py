@@ -1,7 +1,66 @@
+import copy
+import functools
+import hashlib
 import json
+import os
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any
 from ..models import user
 
+# Users whose profile analysis is kept in memory
+PROFILE_MEMO_MAX_ENTRIES = int(os.getenv("PROFILE_MEMO_MAX_ENTRIES", 10000))
+
+def profile_hash(user_data: Dict[str, Any], fields) -> str:
+    """
+    Hash the profile fields a computation reads
+    """
+    payload = json.dumps([user_data.get(field) for field in fields], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+def memoize_profile(*fields: str, max_entries: int = PROFILE_MEMO_MAX_ENTRIES):
+    """
+    Memoize a function of a profile dict per user id and hash of the given fields
+
+    Each user keeps only the result for their current profile, recomputed
+    when one of the fields changes. Profiles without an id are keyed by the
+    hash alone. Callers get a copy, so the memoized result cannot be mutated.
+    """
+    def decorator(compute):
+        entries: "OrderedDict[Any, Any]" = OrderedDict()
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+
+        @functools.wraps(compute)
+        def wrapper(user_data: Dict[str, Any]) -> Dict[str, Any]:
+            digest = profile_hash(user_data, fields)
+            key = user_data.get("id") or digest
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] == digest:
+                    entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return copy.deepcopy(entry[1])
+                stats["misses"] += 1
+            result = compute(user_data)
+            with lock:
+                entries[key] = (digest, copy.deepcopy(result))
+                entries.move_to_end(key)
+                while len(entries) > max_entries:
+                    entries.popitem(last=False)
+            return result
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+                stats.update(hits=0, misses=0)
+
+        wrapper.cache_clear = cache_clear
+        wrapper.cache_info = lambda: {**stats, "entries": len(entries)}
+        return wrapper
+    return decorator
+
+@memoize_profile("name", "headline", "about", "skills", "experience")
 def analyze_user_profile(user_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Analyze user's LinkedIn profile to extract key information for content generation
@@ -74,6 +133,7 @@ def extract_skills_and_interests(user_data: Dict[str, Any]) -> Dict[str, List[st
         "interests": user_data.get("interests", []) if user_data.get("interests") else []
     }
 
+@memoize_profile("skills")
 def get_content_preferences(user_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Determine content preferences based on user profile
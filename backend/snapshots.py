@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy import select, insert, delete, func, text
+from typing import Any, Dict, Iterable, List, Optional
+import os
+
+from .bulk import BULK_MAX_ITEMS
+from .models import AnalyticsSnapshot, Content
+from .models.analytics import analytics_latest
+
+METRIC_FIELDS = ("likes", "comments", "shares", "impressions", "engagement_rate", "reach")
+
+# Snapshots newer than this are kept at full resolution
+SNAPSHOT_RAW_DAYS = int(os.getenv("SNAPSHOT_RAW_DAYS", 30))
+# Snapshots older than this are deleted (on Postgres whole partitions are dropped)
+SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", 365))
+# Monthly partitions created ahead of time on Postgres
+SNAPSHOT_PARTITIONS_AHEAD = int(os.getenv("SNAPSHOT_PARTITIONS_AHEAD", 3))
+
+
+def _month_start(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, 1, tzinfo=timezone.utc)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{AnalyticsSnapshot.__tablename__}_{month.year:04d}_{month.month:02d}"
+
+
+def _field(row: Any, name: str) -> Any:
+    return row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+
+
+def record_snapshots(db, rows: Iterable[Any], captured_at: Optional[datetime] = None) -> int:
+    """
+    Append one snapshot per row with a single executemany INSERT
+
+    Rows are dicts or objects with content_id and the metric fields. All rows
+    share one capture time, so only the last row per content is kept. The
+    caller commits.
+    """
+    captured_at = captured_at or datetime.now(timezone.utc)
+    snapshots: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        snapshot = {field: _field(row, field) or 0 for field in METRIC_FIELDS}
+        snapshot["content_id"] = _field(row, "content_id")
+        snapshot["captured_at"] = _field(row, "captured_at") or captured_at
+        snapshots[snapshot["content_id"], snapshot["captured_at"]] = snapshot
+    if snapshots:
+        db.execute(insert(AnalyticsSnapshot.__table__), list(snapshots.values()))
+    return len(snapshots)
+
+
+def append_snapshots(db, items: List[Dict[str, Any]]) -> int:
+    """
+    Check the referenced content exists, then append the snapshots and commit
+    """
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Snapshot requests are limited to {BULK_MAX_ITEMS} items")
+    content_ids = {item["content_id"] for item in items}
+    if content_ids:
+        found = set(db.execute(select(Content.id).where(Content.id.in_(content_ids))).scalars().all())
+        missing = sorted(content_ids - found)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Content not found: {', '.join(map(str, missing))}")
+    try:
+        created = record_snapshots(db, items)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return created
+
+
+def history_select(content_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   limit: int = 1000):
+    """
+    Build a SELECT for one content's snapshots in capture order
+
+    Bounding captured_at lets Postgres scan only the partitions in range.
+    """
+    query = select(AnalyticsSnapshot).where(AnalyticsSnapshot.content_id == content_id)
+    if since is not None:
+        query = query.where(AnalyticsSnapshot.captured_at >= since)
+    if until is not None:
+        query = query.where(AnalyticsSnapshot.captured_at < until)
+    return query.order_by(AnalyticsSnapshot.captured_at).limit(limit)
+
+
+def latest_select(content_ids: Optional[List[int]] = None, skip: int = 0, limit: int = 100):
+    """
+    Build a SELECT on the latest-snapshot view
+    """
+    query = select(analytics_latest)
+    if content_ids:
+        query = query.where(analytics_latest.c.content_id.in_(content_ids))
+    return query.order_by(analytics_latest.c.content_id).offset(skip).limit(limit)
+
+
+def ensure_partitions(connection, start: Optional[datetime] = None, months_ahead: int = SNAPSHOT_PARTITIONS_AHEAD) -> List[str]:
+    """
+    Create the monthly partitions from start's month through months_ahead months from now
+
+    Only applies to Postgres; other databases keep snapshots in one table.
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+    now = datetime.now(timezone.utc)
+    month = _month_start(start or now)
+    last = _month_start(now)
+    for _ in range(months_ahead):
+        last = _next_month(last)
+
+    created = []
+    while month <= last:
+        name = partition_name(month)
+        connection.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {AnalyticsSnapshot.__tablename__} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_next_month(month).isoformat()}')"
+        ))
+        created.append(name)
+        month = _next_month(month)
+    return created
+
+
+def _day(column, dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc("day", column)
+    return func.date(column)
+
+
+def downsample(connection, older_than: datetime) -> int:
+    """
+    Keep only the last snapshot per content and day for snapshots before older_than
+    """
+    snapshots = AnalyticsSnapshot.__table__
+    newer = snapshots.alias("newer")
+    day = lambda column: _day(column, connection.dialect.name)
+    later_same_day = select(newer.c.content_id).where(
+        newer.c.content_id == snapshots.c.content_id,
+        day(newer.c.captured_at) == day(snapshots.c.captured_at),
+        newer.c.captured_at > snapshots.c.captured_at,
+    ).exists()
+    result = connection.execute(
+        delete(snapshots).where(snapshots.c.captured_at < older_than, later_same_day)
+    )
+    return result.rowcount
+
+
+def _drop_expired_partitions(connection, cutoff: datetime) -> List[str]:
+    partitions = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :table"
+    ), {"table": AnalyticsSnapshot.__tablename__}).scalars().all()
+
+    dropped = []
+    for name in partitions:
+        try:
+            year, month = (int(part) for part in name.rsplit("_", 2)[1:])
+            month_start = datetime(year, month, 1, tzinfo=timezone.utc)
+        except ValueError:
+            # The default partition has no date range
+            continue
+        if _next_month(month_start) <= cutoff:
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    return dropped
+
+
+def apply_retention(connection, raw_days: int = SNAPSHOT_RAW_DAYS, retention_days: int = SNAPSHOT_RETENTION_DAYS,
+                    now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Delete expired snapshots and downsample old ones to one per day
+    """
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=retention_days)
+    dropped = []
+    if connection.dialect.name == "postgresql":
+        dropped = _drop_expired_partitions(connection, cutoff)
+
+    snapshots = AnalyticsSnapshot.__table__
+    deleted = connection.execute(delete(snapshots).where(snapshots.c.captured_at < cutoff)).rowcount
+    downsampled = downsample(connection, now - timedelta(days=raw_days))
+    return {"dropped_partitions": dropped, "deleted": deleted, "downsampled": downsampled}
+
+
+def run_maintenance(engine) -> Dict[str, Any]:
+    """
+    Create upcoming partitions and apply retention and downsampling
+    """
+    with engine.begin() as connection:
+        created = ensure_partitions(connection)
+        result = apply_retention(connection)
+    result["partitions"] = created
+    return result
+
+
+if __name__ == "__main__":
+    from . import database
+
+    print(run_maintenance(database.connect_with_fallback()))
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import copy
+import functools
+import os
+import threading
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Seconds past its TTL an entry is still served while it is refreshed in the background
+SWR_STALE_SECONDS = int(os.getenv("SWR_STALE_SECONDS", 24 * 3600))
+SWR_MAX_ENTRIES = int(os.getenv("SWR_MAX_ENTRIES", 10000))
+SWR_REFRESH_WORKERS = int(os.getenv("SWR_REFRESH_WORKERS", 4))
+
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache that serves stale entries while refreshing them in the background
+
+    A fresh entry is returned as is. Within stale_ttl past its TTL it is
+    still returned, and one background refresh is started. Older or missing
+    entries are fetched inline. Concurrent fetches of the same key share one
+    call, so many callers cost one upstream request. A failed background
+    refresh keeps the stale entry.
+    """
+
+    def __init__(self, stale_ttl: int = SWR_STALE_SECONDS, max_entries: int = SWR_MAX_ENTRIES,
+                 refresh_workers: int = SWR_REFRESH_WORKERS):
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.refresh_workers = refresh_workers
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.hits = self.stale_hits = self.misses = self.coalesced = self.refreshes = self.errors = 0
+
+    def _run(self, key: Hashable, fetch: Callable[[], Any], future: Future):
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.errors += 1
+            future.set_exception(e)
+            return
+        with self._lock:
+            entry = self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(entry)
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Any]) -> Future:
+        # Called with the lock held
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.refresh_workers, thread_name_prefix="swr-refresh")
+        future = Future()
+        self._inflight[key] = future
+        self.refreshes += 1
+        self._executor.submit(self._run, key, fetch, future)
+        return future
+
+    def get(self, key: Hashable, fetch: Callable[[], Any], ttl: int) -> Any:
+        """
+        Return the cached value for key, calling fetch() when it is missing or too old
+        """
+        return self.lookup(key, fetch, ttl)[0]
+
+    def lookup(self, key: Hashable, fetch: Callable[[], Any], ttl: int) -> Tuple[Any, float]:
+        """
+        Like get, but also return the age of the value in seconds
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[1]
+                if age < ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    if age < ttl:
+                        self.hits += 1
+                    else:
+                        self.stale_hits += 1
+                        if key not in self._inflight:
+                            self._refresh(key, fetch)
+                    return entry[0], age
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if owner:
+            self._run(key, fetch, future)
+        value, fetched_at = future.result()
+        return value, max(time.monotonic() - fetched_at, 0.0)
+
+    def cached(self, source: str, ttl: int):
+        """
+        Decorate a fetch function so its results are cached per source and arguments
+
+        Callers get copies, since one result is shared by every caller.
+        """
+        def decorator(fetch):
+            @functools.wraps(fetch)
+            def wrapper(*args):
+                return copy.deepcopy(self.get((source,) + args, lambda: fetch(*args), ttl))
+            return wrapper
+        return decorator
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Wait for the fetches and refreshes in flight
+        """
+        with self._lock:
+            futures = list(self._inflight.values())
+        wait(futures, timeout=timeout)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "stale_ttl_seconds": self.stale_ttl,
+                "entries": len(self._entries),
+                "in_flight": len(self._inflight),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+            }
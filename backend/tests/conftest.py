@@ -0,0 +1,31 @@
+import os
+import pytest
+
+# Keep generated content cached per test run instead of in the shared cache file
+os.environ.setdefault("PROMPT_CACHE_BACKEND", "memory")
+
+from ..cache import response_cache, prompt_cache
+from ..principals import principal_cache
+from ..drafts import draft_store
+from ..services import user_profile_service, industry_research_service, linkedin_service
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # Tests use separate databases that reuse the same ids
+    response_cache.clear()
+    principal_cache.clear()
+    prompt_cache.clear()
+    draft_store.clear()
+    user_profile_service.analyze_user_profile.cache_clear()
+    user_profile_service.get_content_preferences.cache_clear()
+    industry_research_service.research_cache.clear()
+    linkedin_service.profile_cache.clear()
+    yield
+    response_cache.clear()
+    principal_cache.clear()
+    prompt_cache.clear()
+    draft_store.clear()
+    user_profile_service.analyze_user_profile.cache_clear()
+    user_profile_service.get_content_preferences.cache_clear()
+    industry_research_service.research_cache.clear()
+    linkedin_service.profile_cache.clear()
@@ -190,4 +190,122 @@ def test_get_user_content():
     data = response.json()
     assert len(data) >= 1
     assert data[0]["title"] == "Test Content 3"
-    assert data[0]["user_id"] == user_id
\ No newline at end of file
+    assert data[0]["user_id"] == user_id
+
+def test_get_users_page():
+    # Create a few users to page through
+    for i in range(3):
+        user_data = {
+            "linkedin_profile_url": f"https://www.linkedin.com/in/pageuser{i}",
+            "name": f"Page User {i}"
+        }
+        response = client.post("/api/v1/users/", json=user_data)
+        assert response.status_code == 201
+    
+    # Walk the keyset pages two users at a time
+    seen_ids = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/users/page", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) <= 2
+        seen_ids.extend(item["id"] for item in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert seen_ids == sorted(seen_ids)
+    assert len(seen_ids) == len(set(seen_ids)) >= 3
+    
+    # Offset pagination is still available
+    response = client.get("/api/v1/users/", params={"skip": 0, "limit": 2})
+    assert response.status_code == 200
+    assert [user["id"] for user in response.json()] == seen_ids[:2]
+
+def test_get_users_page_invalid_cursor():
+    response = client.get("/api/v1/users/page", params={"cursor": "invalid"})
+    assert response.status_code == 400
+
+def test_bulk_create_content_and_analytics():
+    # First create a user to associate content with
+    user_data = {
+        "linkedin_profile_url": "https://www.linkedin.com/in/bulkapiuser",
+        "name": "Bulk API User"
+    }
+    create_user_response = client.post("/api/v1/users/", json=user_data)
+    assert create_user_response.status_code == 201
+    user_id = create_user_response.json()["id"]
+    
+    # Create several content items in one request, one of them invalid
+    content_items = [
+        {"user_id": user_id, "title": f"Bulk Post {i}", "body": "Bulk body", "content_type": "text"}
+        for i in range(3)
+    ]
+    content_items.append({"user_id": user_id, "title": "Missing body"})
+    
+    response = client.post("/api/v1/content/bulk", json=content_items)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert data["failed"] == 1
+    assert data["results"][3]["status"] == "error"
+    content_ids = [result["id"] for result in data["results"][:3]]
+    
+    response = client.get(f"/api/v1/content/{content_ids[1]}")
+    assert response.status_code == 200
+    assert response.json()["title"] == "Bulk Post 1"
+    
+    # Record analytics for the new content in one request
+    analytics_items = [{"content_id": content_id, "likes": 10, "impressions": 100} for content_id in content_ids]
+    response = client.post("/api/v1/analytics/bulk", json=analytics_items)
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+
+def test_patch_user():
+    # First create a user
+    user_data = {
+        "linkedin_profile_url": "https://www.linkedin.com/in/patchapiuser",
+        "name": "Patch API User",
+        "headline": "Engineer",
+        "about": "Original about"
+    }
+    create_response = client.post("/api/v1/users/", json=user_data)
+    assert create_response.status_code == 201
+    user_id = create_response.json()["id"]
+    
+    # Patch a single field
+    response = client.patch(f"/api/v1/users/{user_id}", json={"headline": "Principal Engineer"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["headline"] == "Principal Engineer"
+    assert data["about"] == "Original about"
+    assert data["updated_at"] is not None
+    
+    response = client.patch("/api/v1/users/999999", json={"headline": "Nobody"})
+    assert response.status_code == 404
+
+def test_get_users_filtered_by_skill():
+    user_data = {
+        "linkedin_profile_url": "https://www.linkedin.com/in/skilluser",
+        "name": "Skill User",
+        "skills": ["Rust", "Distributed Systems"],
+        "interests": "Open Source, Databases"
+    }
+    create_response = client.post("/api/v1/users/", json=user_data)
+    assert create_response.status_code == 201
+    data = create_response.json()
+    assert data["skills"] == ["Rust", "Distributed Systems"]
+    assert data["interests"] == ["Open Source", "Databases"]
+    
+    response = client.get("/api/v1/users/", params={"skill": "Distributed Systems"})
+    assert response.status_code == 200
+    names = [user["name"] for user in response.json()]
+    assert "Skill User" in names
+    
+    response = client.get("/api/v1/users/", params={"skill": "Distributed"})
+    assert response.status_code == 200
+    assert "Skill User" not in [user["name"] for user in response.json()]
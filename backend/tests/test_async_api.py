@@ -0,0 +1,148 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import Base, async_get_db, create_async_db_engine
+from ..models import user, content, analytics
+from ..routers import async_users, async_content, async_analytics
+
+@pytest.fixture
+def client(tmp_path):
+    database_path = tmp_path / "async_test.db"
+    
+    # Create tables with a sync engine on the same file
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{database_path}")
+    TestingAsyncSessionLocal = sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+    
+    async def override_async_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+    
+    app = FastAPI()
+    app.include_router(async_users.router, prefix="/api/v1/users")
+    app.include_router(async_content.router, prefix="/api/v1/content")
+    app.include_router(async_analytics.router, prefix="/api/v1/analytics")
+    app.dependency_overrides[async_get_db] = override_async_get_db
+    
+    with TestClient(app) as test_client:
+        yield test_client
+
+def test_async_user_crud(client):
+    user_data = {
+        "linkedin_profile_url": "https://www.linkedin.com/in/asyncuser",
+        "name": "Async User",
+        "headline": "Software Engineer"
+    }
+    
+    response = client.post("/api/v1/users/", json=user_data)
+    assert response.status_code == 201
+    created_user = response.json()
+    assert created_user["name"] == "Async User"
+    assert "created_at" in created_user
+    
+    response = client.get(f"/api/v1/users/{created_user['id']}")
+    assert response.status_code == 200
+    assert response.json() == created_user
+    
+    user_data["headline"] = "Staff Engineer"
+    response = client.put(f"/api/v1/users/{created_user['id']}", json=user_data)
+    assert response.status_code == 200
+    assert response.json()["headline"] == "Staff Engineer"
+    
+    response = client.get("/api/v1/users/")
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    
+    response = client.get("/api/v1/users/9999")
+    assert response.status_code == 404
+    assert response.json() == {"detail": "User not found"}
+
+def test_async_content_and_analytics(client):
+    user_response = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/asynccontent"})
+    user_id = user_response.json()["id"]
+    
+    content_data = {
+        "user_id": user_id,
+        "title": "Async Content",
+        "body": "Content created through the async router",
+        "content_type": "text"
+    }
+    response = client.post("/api/v1/content/", json=content_data)
+    assert response.status_code == 201
+    content_id = response.json()["id"]
+    
+    response = client.get(f"/api/v1/content/user/{user_id}")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [content_id]
+    
+    response = client.post("/api/v1/analytics/", json={"content_id": content_id, "likes": 10, "impressions": 200})
+    assert response.status_code == 201
+    
+    response = client.get(f"/api/v1/analytics/content/{content_id}")
+    assert response.status_code == 200
+    assert response.json()["likes"] == 10
+    
+    response = client.get("/api/v1/analytics/content/9999")
+    assert response.status_code == 404
+
+def test_async_bulk_content(client):
+    user_response = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/asyncbulk"})
+    user_id = user_response.json()["id"]
+    
+    items = [
+        {"user_id": user_id, "title": f"Async Bulk {i}", "body": "Bulk body", "content_type": "text"}
+        for i in range(3)
+    ]
+    items.append({"user_id": 9999, "body": "Unknown user", "content_type": "text"})
+    
+    response = client.post("/api/v1/content/bulk", json=items)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert data["results"][3]["error"] == "User not found"
+    
+    response = client.get(f"/api/v1/content/user/{user_id}")
+    assert len(response.json()) == 3
+
+def test_async_patch_content(client):
+    user_response = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/asyncpatch"})
+    content_data = {
+        "user_id": user_response.json()["id"],
+        "title": "Original title",
+        "body": "Original body",
+        "content_type": "text"
+    }
+    content_id = client.post("/api/v1/content/", json=content_data).json()["id"]
+    
+    response = client.patch(f"/api/v1/content/{content_id}", json={"posted": True})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["posted"] is True
+    assert data["title"] == "Original title"
+    
+    response = client.patch("/api/v1/content/9999", json={"posted": True})
+    assert response.status_code == 404
+
+def test_async_conditional_get(client):
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/asyncetag"}).json()["id"]
+    
+    response = client.get(f"/api/v1/users/{user_id}")
+    etag = response.headers["etag"]
+    
+    response = client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = client.get("/api/v1/content/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    
+    list_etag = client.get("/api/v1/users/").headers["etag"]
+    assert client.get("/api/v1/users/", headers={"If-None-Match": list_etag}).status_code == 304
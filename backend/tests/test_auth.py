@@ -1,9 +1,12 @@
 import pytest
+import time
+from sqlalchemy import event
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from ..main import app
 from ..database import Base, get_db
+from .. import principals
 
 # Create a test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -65,4 +68,53 @@ def test_logout():
     response = client.post("/api/v1/auth/logout", headers={"Authorization": f"Bearer {access_token}"})
     assert response.status_code == 200
     data = response.json()
-    assert data["message"] == "Successfully logged out"
\ No newline at end of file
+    assert data["message"] == "Successfully logged out"
+
+def login(username):
+    response = client.post("/api/v1/auth/token", data={"username": username, "password": "testpassword"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def test_cached_principal_skips_database():
+    headers = login("https://www.linkedin.com/in/cachedprincipal")
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    statements = []
+    record = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/auth/me", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    assert response.json()["linkedin_profile_url"] == "https://www.linkedin.com/in/cachedprincipal"
+    assert statements == []
+    assert principals.principal_cache.stats()["hits"] >= 1
+
+def test_user_update_invalidates_principal():
+    headers = login("https://www.linkedin.com/in/updatedprincipal")
+    user = client.get("/api/v1/auth/me", headers=headers).json()
+
+    response = client.patch(f"/api/v1/users/{user['id']}", json={"headline": "Updated Headline"})
+    assert response.status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).json()["headline"] == "Updated Headline"
+
+def test_logout_revokes_token():
+    headers = login("https://www.linkedin.com/in/loggedoutprincipal")
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+    assert client.post("/api/v1/auth/logout", headers=headers).status_code == 200
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+def test_principal_cache_is_bounded_and_expires():
+    cache = principals.PrincipalCache(max_entries=2, ttl=60)
+    for user_id in (1, 2, 3):
+        cache.put(f"token{user_id}", principals.Principal(id=user_id))
+    assert cache.get("token1") is None
+    assert cache.get("token3").id == 3
+
+    # The token's exp bounds the entry's lifetime
+    cache.put("expiring", principals.Principal(id=4), expires_at=time.time() - 1)
+    assert cache.get("expiring") is None
+
+    cache.invalidate_user(3)
+    assert cache.get("token3") is None
+    assert cache.stats()["entries"] == 1
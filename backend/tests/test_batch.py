@@ -0,0 +1,116 @@
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch, MagicMock
+from ..database import create_db_engine, get_db
+from ..models import Content
+from ..routers import users, content
+from .. import batch, migrations
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    migrations.upgrade(engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/v1/users")
+    app.include_router(content.router, prefix="/api/v1/content")
+    app.dependency_overrides[get_db] = override_get_db
+    test_client = TestClient(app)
+    test_client.session_factory = TestingSessionLocal
+    yield test_client
+    engine.dispose()
+
+async def acreate(prompt, **params):
+    await asyncio.sleep(0.01)
+    return MagicMock(choices=[MagicMock(text=f"Generated with {params['max_tokens']} tokens")])
+
+def read_lines(response):
+    return sorted((json.loads(line) for line in response.iter_lines() if line), key=lambda line: line["index"])
+
+@patch('backend.services.content_generation_service.openai.Completion.acreate', side_effect=acreate)
+def test_batch_streams_results_and_persists(mock_acreate, client):
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/batchuser", "name": "Batch User", "skills": ["Python"]}).json()["id"]
+    items = [
+        {"user_id": user_id, "topic": "Data contracts", "content_type": "text"},
+        {"user_id": user_id, "topic": "Feature stores explained", "content_type": "article"},
+        {"user_id": 999, "topic": "Unknown user"},
+        {"user_id": user_id, "topic": "Polls", "content_type": "poll"},
+        {"topic": "Missing user id"},
+    ]
+
+    with client.stream("POST", "/api/v1/content/generate/batch?persist=true", json=items) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith(batch.NDJSON_MEDIA_TYPE)
+        lines = read_lines(response)
+
+    assert [line["status"] for line in lines] == ["generated", "generated", "error", "error", "error"]
+    assert lines[1]["body"] == "Generated with 1500 tokens"
+    assert lines[2]["error"] == "User not found"
+    assert "Unsupported content type" in lines[3]["error"]
+
+    db = client.session_factory()
+    try:
+        stored = db.execute(select(Content).order_by(Content.id)).scalars().all()
+        assert sorted(row.id for row in stored) == sorted(line["content_id"] for line in lines[:2])
+        assert {row.content_type for row in stored} == {"text", "article"}
+    finally:
+        db.close()
+
+@patch('backend.services.content_generation_service.openai.Completion.acreate', side_effect=acreate)
+def test_batch_accepts_ndjson_without_persisting(mock_acreate, client):
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/ndjsonuser", "name": "NDJSON User"}).json()["id"]
+    body = "\n".join(json.dumps({"user_id": user_id, "topic": f"Distinct subject number {i}"}) for i in range(20)) + "\nnot json\n"
+
+    response = client.post(
+        "/api/v1/content/generate/batch",
+        content=body,
+        headers={"Content-Type": batch.NDJSON_MEDIA_TYPE},
+    )
+    lines = read_lines(response)
+    assert len(lines) == 21
+    assert all(line["status"] == "generated" and "content_id" not in line for line in lines[:20])
+    assert lines[20]["error"].startswith("Invalid item")
+
+def test_batch_limits_json_arrays(client, monkeypatch):
+    monkeypatch.setattr(batch, "BULK_MAX_ITEMS", 2)
+    response = client.post("/api/v1/content/generate/batch", json=[{"user_id": 1, "topic": "x"}] * 3)
+    assert response.status_code == 413
+
+def test_batch_worker_pool_is_bounded():
+    running = []
+    peak = []
+
+    async def load_user(user_id):
+        return {"id": user_id, "name": "Pool User"}
+
+    async def slow_acreate(prompt, **params):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.pop()
+        return MagicMock(choices=[MagicMock(text="Post")])
+
+    async def items():
+        for i in range(12):
+            yield {"user_id": 1, "topic": f"Bounded subject {i}"}
+
+    async def run():
+        return [line async for line in batch.generate_batch(items(), load_user, workers=3)]
+
+    with patch('backend.services.content_generation_service.openai.Completion.acreate', side_effect=slow_acreate):
+        lines = asyncio.run(run())
+    assert len(lines) == 12
+    assert max(peak) == 3
@@ -0,0 +1,96 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from ..database import Base
+from ..models import User, Content, Analytics
+from .. import bulk, schemas
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(linkedin_profile_url="https://www.linkedin.com/in/bulkuser"))
+    session.commit()
+    yield session
+    session.close()
+
+def content_item(**overrides):
+    item = {"user_id": 1, "title": "Bulk post", "body": "Bulk body", "content_type": "text"}
+    item.update(overrides)
+    return item
+
+def test_bulk_create_returns_ids_in_order(db):
+    items = [content_item(title=f"Post {i}") for i in range(5)]
+    
+    result = bulk.bulk_write(db, Content, schemas.ContentCreate, items, parent=("user_id", User))
+    
+    assert result["created"] == 5
+    assert result["failed"] == 0
+    for item_result in result["results"]:
+        row = db.get(Content, item_result["id"])
+        assert row.title == f"Post {item_result['index']}"
+        assert item_result["status"] == "created"
+
+def test_bulk_reports_invalid_items(db):
+    items = [
+        content_item(),
+        {"user_id": 1, "title": "Missing body and type"},
+        content_item(user_id=999),
+    ]
+    
+    result = bulk.bulk_write(db, Content, schemas.ContentCreate, items, parent=("user_id", User))
+    
+    assert result["created"] == 1
+    assert result["failed"] == 2
+    assert result["results"][0]["status"] == "created"
+    assert result["results"][1]["status"] == "error"
+    assert "body" in result["results"][1]["error"]
+    assert result["results"][2]["error"] == "User not found"
+    assert db.execute(select(func.count(Content.id))).scalar() == 1
+
+def test_bulk_updates_existing_rows(db):
+    created = bulk.bulk_write(db, Content, schemas.ContentCreate, [content_item(), content_item()])
+    first_id = created["results"][0]["id"]
+    
+    result = bulk.bulk_write(db, Content, schemas.ContentCreate, [
+        content_item(id=first_id, title="Updated title"),
+        content_item(id=12345),
+        content_item(title="New post"),
+    ])
+    
+    assert result["updated"] == 1
+    assert result["created"] == 1
+    assert result["results"][1]["error"] == "Content not found"
+    db.expire_all()
+    assert db.get(Content, first_id).title == "Updated title"
+
+def test_bulk_analytics_checks_content(db):
+    created = bulk.bulk_write(db, Content, schemas.ContentCreate, [content_item()])
+    content_id = created["results"][0]["id"]
+    
+    result = bulk.bulk_write(db, Analytics, schemas.AnalyticsCreate, [
+        {"content_id": content_id, "likes": 5},
+        {"content_id": 999, "likes": 1},
+    ], parent=("content_id", Content))
+    
+    assert result["created"] == 1
+    assert result["results"][1]["error"] == "Content not found"
+
+def test_bulk_create_many_rows(db):
+    items = [content_item(title=f"Post {i}") for i in range(10000)]
+    
+    result = bulk.bulk_write(db, Content, schemas.ContentCreate, items, parent=("user_id", User))
+    
+    assert result["created"] == 10000
+    ids = [item_result["id"] for item_result in result["results"]]
+    assert len(set(ids)) == 10000
+    assert db.get(Content, ids[-1]).title == "Post 9999"
+
+def test_bulk_rejects_oversized_request(db, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_MAX_ITEMS", 2)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        bulk.bulk_write(db, Content, schemas.ContentCreate, [content_item()] * 3)
+    assert exc_info.value.status_code == 413
@@ -0,0 +1,118 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from ..database import create_db_engine, get_db
+from ..routers import users, content, analytics
+from .. import cache, migrations
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    migrations.upgrade(engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/v1/users")
+    app.include_router(content.router, prefix="/api/v1/content")
+    app.include_router(analytics.router, prefix="/api/v1/analytics")
+    app.dependency_overrides[get_db] = override_get_db
+    cache.response_cache.reset_stats()
+    yield TestClient(app)
+    engine.dispose()
+
+class BrokenBackend:
+    name = "broken"
+
+    def get(self, key):
+        raise ConnectionError("cache down")
+
+    set = delete = get
+
+    def size(self):
+        return None
+
+def test_memory_cache_expires_and_evicts(monkeypatch):
+    backend = cache.MemoryCache(max_entries=2)
+    backend.set("a", "1", ttl=60)
+    backend.set("b", "2", ttl=60)
+    assert backend.get("a") == "1"
+
+    # "b" is now the least recently used entry
+    backend.set("c", "3", ttl=60)
+    assert backend.get("b") is None
+    assert backend.size() == 2
+
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 61)
+    assert backend.get("a") is None
+
+def test_disk_cache_is_shared_and_bounded(tmp_path, monkeypatch):
+    path = str(tmp_path / "prompts.db")
+    backend = cache.DiskCache(path, max_entries=2)
+    backend.set("a", "1", ttl=60)
+    # A second instance (e.g. another worker) sees the same entries
+    assert cache.DiskCache(path).get("a") == "1"
+
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 1)
+    backend.set("b", "2", ttl=60)
+    monkeypatch.setattr(cache.time, "time", lambda: now + 2)
+    assert backend.get("a") == "1"
+    monkeypatch.setattr(cache.time, "time", lambda: now + 3)
+    backend.set("c", "3", ttl=60)
+    assert backend.get("b") is None
+    assert backend.size() == 2
+
+    monkeypatch.setattr(cache.time, "time", lambda: now + 100)
+    assert backend.get("a") is None
+
+def test_prompt_key_covers_model_parameters():
+    key = cache.prompt_key("Write a post", {"max_tokens": 300, "temperature": 0.7})
+    assert key == cache.prompt_key("Write a post", {"temperature": 0.7, "max_tokens": 300})
+    assert key != cache.prompt_key("Write a post", {"max_tokens": 300, "temperature": 0.9})
+
+def test_backend_errors_count_as_misses():
+    response_cache = cache.ResponseCache(BrokenBackend())
+    assert response_cache.get("user:1") is None
+    assert response_cache.set("user:1", {"id": 1}) == {"id": 1}
+    stats = response_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["errors"] == 2
+
+def test_get_user_is_cached_and_written_through(client):
+    user_data = {"linkedin_profile_url": "https://www.linkedin.com/in/cacheuser", "name": "Cache User", "headline": "Engineer"}
+    user_id = client.post("/api/v1/users/", json=user_data).json()["id"]
+
+    first = client.get(f"/api/v1/users/{user_id}")
+    second = client.get(f"/api/v1/users/{user_id}")
+    assert first.json() == second.json()
+    stats = cache.response_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    client.patch(f"/api/v1/users/{user_id}", json={"headline": "Staff Engineer"})
+    assert client.get(f"/api/v1/users/{user_id}").json()["headline"] == "Staff Engineer"
+
+def test_writes_invalidate_content_and_analytics(client):
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/cachewriter", "name": "Writer"}).json()["id"]
+    content_id = client.post("/api/v1/content/", json={"user_id": user_id, "title": "Draft", "body": "Body", "content_type": "text"}).json()["id"]
+    client.post("/api/v1/analytics/", json={"content_id": content_id, "likes": 1})
+
+    assert client.get(f"/api/v1/content/{content_id}").json()["title"] == "Draft"
+    assert client.get(f"/api/v1/analytics/content/{content_id}").json()["likes"] == 1
+
+    response = client.post("/api/v1/content/bulk", json=[{"id": content_id, "user_id": user_id, "title": "Final", "body": "Body", "content_type": "text"}])
+    assert response.json()["updated"] == 1
+    assert client.get(f"/api/v1/content/{content_id}").json()["title"] == "Final"
+
+    analytics_id = client.get(f"/api/v1/analytics/content/{content_id}").json()["id"]
+    client.put(f"/api/v1/analytics/{analytics_id}", json={"content_id": content_id, "likes": 50})
+    assert client.get(f"/api/v1/analytics/content/{content_id}").json()["likes"] == 50
+    assert cache.response_cache.stats()["invalidations"] >= 3
@@ -0,0 +1,79 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from ..database import create_db_engine, get_db
+from ..routers import users, content
+from .. import cache, migrations
+
+@pytest.fixture
+def client(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'conditional.db'}")
+    migrations.upgrade(engine)
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(users.router, prefix="/api/v1/users")
+    app.include_router(content.router, prefix="/api/v1/content")
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    engine.dispose()
+
+def create_user(client, name):
+    user_data = {"linkedin_profile_url": f"https://www.linkedin.com/in/{name.lower()}", "name": name}
+    return client.post("/api/v1/users/", json=user_data).json()["id"]
+
+def test_single_resource_revalidation(client):
+    user_id = create_user(client, "Etag")
+
+    response = client.get(f"/api/v1/users/{user_id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "last-modified" in response.headers
+
+    response = client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    # Without a cached copy the version comes from the id and timestamps alone
+    cache.response_cache.clear()
+    response = client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get(f"/api/v1/users/{user_id}", headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert response.status_code == 304
+
+    client.patch(f"/api/v1/users/{user_id}", json={"headline": "Updated"})
+    response = client.get(f"/api/v1/users/{user_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["headline"] == "Updated"
+
+    assert client.get("/api/v1/users/9999", headers={"If-None-Match": etag}).status_code == 404
+
+def test_list_revalidation(client):
+    user_id = create_user(client, "Lister")
+
+    response = client.get("/api/v1/users/")
+    etag = response.headers["etag"]
+    assert client.get("/api/v1/users/", headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.get("/api/v1/users/page", params={"limit": 10})
+    page_etag = response.headers["etag"]
+    assert client.get("/api/v1/users/page", params={"limit": 10}, headers={"If-None-Match": page_etag}).status_code == 304
+
+    create_user(client, "Newcomer")
+    assert client.get("/api/v1/users/", headers={"If-None-Match": etag}).status_code == 200
+
+    response = client.get(f"/api/v1/content/user/{user_id}")
+    assert response.json() == []
+    assert "etag" not in response.headers
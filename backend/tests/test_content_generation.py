@@ -1,6 +1,9 @@
+import asyncio
+import time
 import pytest
 from unittest.mock import patch, MagicMock
 from ..services import content_generation_service
+from .. import cache, drafts
 
 @patch('backend.services.content_generation_service.openai.Completion.create')
 def test_generate_text_content(mock_openai_create):
@@ -133,4 +136,106 @@ def test_generate_content_title():
     # Test poll content type
     title_poll = content_generation_service.generate_content_title(topic, "poll")
     assert "Artificial Intelligence" in title_poll
-    assert "What do you think" in title_poll
\ No newline at end of file
+    assert "What do you think" in title_poll
+
+@patch('backend.services.content_generation_service.openai.Completion.create')
+def test_generation_is_cached_per_prompt(mock_openai_create):
+    mock_openai_create.return_value = MagicMock(choices=[MagicMock(text="Cached post content.")])
+    user_profile = {"professional_identity": {"name": "Test User", "headline": "Analyst"}}
+
+    first = content_generation_service.generate_text_content(user_profile, "Open Banking")
+    second = content_generation_service.generate_text_content(user_profile, "Open Banking")
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert second["body"] == "Cached post content."
+    assert mock_openai_create.call_count == 1
+
+    # Other content types render a different prompt and parameters
+    assert content_generation_service.generate_article_content(user_profile, "Open Banking")["cached"] is False
+
+    mock_openai_create.return_value = MagicMock(choices=[MagicMock(text="Fresh post content.")])
+    fresh = content_generation_service.generate_text_content(user_profile, "Open Banking", fresh=True)
+    assert fresh["cached"] is False
+    assert content_generation_service.generate_text_content(user_profile, "Open Banking")["body"] == "Fresh post content."
+    assert mock_openai_create.call_count == 3
+
+@patch('backend.services.content_generation_service.openai.Completion.create')
+def test_failed_generation_is_not_cached(mock_openai_create):
+    mock_openai_create.side_effect = Exception("rate limited")
+    user_profile = {"professional_identity": {"name": "Test User"}}
+    sets = cache.prompt_cache.stats()["sets"]
+
+    result = content_generation_service.generate_carousel_content(user_profile, "Payments")
+    assert result["status"] == "error"
+    assert cache.prompt_cache.stats()["sets"] == sets
+
+@patch('backend.services.content_generation_service.openai.Completion.create')
+def test_near_duplicate_topics_reuse_drafts(mock_openai_create):
+    mock_openai_create.return_value = MagicMock(choices=[MagicMock(text="FinTech draft.")])
+    analyst = {"professional_identity": {"name": "Analyst", "headline": "FinTech Analyst"}}
+    founder = {"professional_identity": {"name": "Founder", "headline": "FinTech Founder"}}
+
+    content_generation_service.generate_text_content(analyst, "Latest trends in FinTech")
+    result = content_generation_service.generate_text_content(founder, "FinTech: the latest trends")
+    assert result["cached"] is True
+    assert result["body"] == "FinTech draft."
+    assert result["similar_topic"] == "Latest trends in FinTech"
+    assert result["similarity"] >= drafts.DRAFT_SIMILARITY_THRESHOLD
+    assert mock_openai_create.call_count == 1
+
+    # A different industry is not close enough
+    assert content_generation_service.generate_text_content(founder, "Latest trends in HealthTech")["cached"] is False
+    assert content_generation_service.generate_text_content(founder, "FinTech: the latest trends", fresh=True)["cached"] is False
+    assert mock_openai_create.call_count == 3
+
+def test_draft_store_threshold_and_scopes():
+    store = drafts.DraftStore(threshold=0.75, max_entries=2)
+    store.put("text", "Remote work culture tips", "draft")
+    assert store.find("text", "Tips for remote work culture").draft == "draft"
+    assert store.find("article", "Tips for remote work culture") is None
+    assert store.find("text", "Remote work culture tips", threshold=1.01) is None
+
+    store.put("text", "Latest trends in FinTech", "fintech")
+    store.put("text", "Hiring data engineers", "hiring")
+    assert store.find("text", "Remote work culture tips") is None
+    assert store.stats()["entries"] == 2
+
+def test_calendar_entries_are_generated_concurrently():
+    async def acreate(prompt, **params):
+        await asyncio.sleep(0.2)
+        if "Failing topic" in prompt:
+            raise Exception("rate limited")
+        return MagicMock(choices=[MagicMock(text=f"Post with {params['max_tokens']} tokens")])
+
+    user_profile = {"professional_identity": {"name": "Test User"}}
+    calendar = [{"date": f"2025-09-0{day}", "topic": f"Topic {day}", "content_type": "text"} for day in range(1, 7)]
+    calendar.append({"date": "2025-09-07", "topic": "Failing topic", "content_type": "case_studies"})
+    calendar[0]["content_type"] = "article"
+
+    with patch('backend.services.content_generation_service.openai.Completion.acreate', side_effect=acreate):
+        start = time.perf_counter()
+        result = asyncio.run(content_generation_service.generate_calendar_content(user_profile, calendar, max_concurrency=7))
+        elapsed = time.perf_counter() - start
+
+    # Seven 0.2s completions finish in about the time of one
+    assert elapsed < 0.8
+    assert [entry["date"] for entry in result] == [entry["date"] for entry in calendar]
+    assert result[0]["content"]["body"] == "Post with 1500 tokens"
+    assert result[1]["content"]["status"] == "generated"
+    assert result[6]["content"]["status"] == "error"
+    assert result[6]["content"]["content_type"] == "text"
+
+def test_calendar_concurrency_is_limited():
+    running = []
+    peak = []
+
+    async def acreate(prompt, **params):
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.pop()
+        return MagicMock(choices=[MagicMock(text="Post")])
+
+    calendar = [{"topic": f"Limited topic {day}", "content_type": "text"} for day in range(7)]
+    with patch('backend.services.content_generation_service.openai.Completion.acreate', side_effect=acreate):
+        asyncio.run(content_generation_service.generate_calendar_content({}, calendar, max_concurrency=2))
+    assert max(peak) == 2
@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from ..services import industry_research_service
+from .. import swr
+import threading
 
 def test_get_trending_topics():
     # Test industry and skills
@@ -119,4 +121,56 @@ def test_get_hashtag_suggestions():
     else:
         # If none of the theme hashtags are in result, that's fine
         # (we add theme-based hashtags based on content_theme)
-        pass
\ No newline at end of file
+        pass
+
+def test_industry_results_are_shared_across_users():
+    misses = industry_research_service.research_cache.stats()["misses"]
+    first = industry_research_service.get_trending_topics("FinTech", ["Python"])
+    second = industry_research_service.get_trending_topics("FinTech", ["Payments", "Risk"])
+    assert first[0] == second[0]
+    assert [topic["topic"] for topic in second[2:]] == ["Advanced Payments techniques", "Advanced Risk techniques"]
+
+    # Callers get copies of the shared result
+    first[0]["topic"] = "Changed"
+    assert industry_research_service.get_trending_topics("FinTech", [])[0]["topic"] == "Latest trends in FinTech"
+    assert industry_research_service.research_cache.stats()["misses"] == misses + 1
+
+def test_concurrent_fetches_are_coalesced():
+    cache = swr.StaleWhileRevalidateCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return ["news"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("news", fetch, ttl=60))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["coalesced"] < 19:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [["news"]] * 20
+    assert len(calls) == 1
+
+def test_stale_entries_are_served_while_refreshing(monkeypatch):
+    cache = swr.StaleWhileRevalidateCache(stale_ttl=300)
+    versions = iter(["v1", "v2"])
+    assert cache.get("topics", lambda: next(versions), ttl=60) == "v1"
+
+    now = swr.time.monotonic()
+    monkeypatch.setattr(swr.time, "monotonic", lambda: now + 120)
+    assert cache.get("topics", lambda: next(versions), ttl=60) == "v1"
+    cache.wait(5)
+    assert cache.get("topics", lambda: next(versions), ttl=60) == "v2"
+
+    # A failed refresh keeps serving the stale value
+    monkeypatch.setattr(swr.time, "monotonic", lambda: now + 250)
+    assert cache.get("topics", lambda: 1 / 0, ttl=60) == "v2"
+    cache.wait(5)
+    assert cache.get("topics", lambda: "v3", ttl=60) == "v2"
+    assert cache.stats()["errors"] == 1
@@ -5,6 +5,8 @@ from sqlalchemy.orm import sessionmaker
 from unittest.mock import patch, MagicMock
 from ..main import app
 from ..database import Base, get_db
+from ..services import linkedin_service
+from .. import swr
 
 # Create a test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -198,4 +200,55 @@ def test_get_linkedin_analytics(mock_get_post_analytics):
     # Test get_linkedin_analytics endpoint
     response = client.get(f"/api/v1/linkedin/analytics/{content_id}")
     # Note: This might not work correctly in testing because of the mock
-    # In a real implementation, you would need to properly mock the database session
\ No newline at end of file
+    # In a real implementation, you would need to properly mock the database session
+
+PROFILE = {
+    "name": "Cached Profile",
+    "headline": "Head of Data",
+    "about": "Fetched from LinkedIn",
+    "skills": ["SQL"],
+    "experience": [],
+    "education": []
+}
+
+@patch('backend.services.linkedin_service.get_user_profile')
+def test_profile_is_cached_and_synced(mock_get_user_profile):
+    mock_get_user_profile.return_value = PROFILE
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/cachedprofile", "name": "Old Name"}).json()["id"]
+
+    response = client.get(f"/api/v1/linkedin/profile/{user_id}")
+    assert response.status_code == 200
+    assert response.json()["cache_age_seconds"] < 5
+    assert client.get(f"/api/v1/users/{user_id}").json()["headline"] == "Head of Data"
+
+    response = client.get(f"/api/v1/linkedin/profile/{user_id}")
+    assert response.json()["name"] == "Cached Profile"
+    assert "Age" in response.headers
+    assert mock_get_user_profile.call_count == 1
+
+@patch('backend.services.linkedin_service.get_user_profile')
+def test_stale_profile_refreshes_in_background(mock_get_user_profile, monkeypatch):
+    mock_get_user_profile.return_value = PROFILE
+    user_id = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/staleprofile", "name": "Old Name"}).json()["id"]
+    client.get(f"/api/v1/linkedin/profile/{user_id}")
+
+    mock_get_user_profile.return_value = {**PROFILE, "headline": "VP Data"}
+    now = swr.time.monotonic()
+    monkeypatch.setattr(swr.time, "monotonic", lambda: now + linkedin_service.LINKEDIN_PROFILE_TTL_SECONDS + 1)
+    response = client.get(f"/api/v1/linkedin/profile/{user_id}")
+    # The stale copy is served while the refresh runs
+    assert response.json()["headline"] == "Head of Data"
+    assert response.json()["cache_age_seconds"] > linkedin_service.LINKEDIN_PROFILE_TTL_SECONDS
+    linkedin_service.profile_cache.wait(5)
+
+    assert client.get(f"/api/v1/users/{user_id}").json()["headline"] == "VP Data"
+    assert client.get(f"/api/v1/linkedin/profile/{user_id}").json()["headline"] == "VP Data"
+
+def test_sync_writes_only_changed_profiles():
+    db = TestingSessionLocal()
+    try:
+        client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/syncprofile", "name": "Old Name"})
+        assert linkedin_service.sync_user_profile(db, "https://www.linkedin.com/in/syncprofile", PROFILE) != []
+        assert linkedin_service.sync_user_profile(db, "https://www.linkedin.com/in/syncprofile", PROFILE) == []
+    finally:
+        db.close()
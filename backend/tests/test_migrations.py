@@ -0,0 +1,50 @@
+import json
+import pytest
+from sqlalchemy import inspect, text
+from ..database import create_db_engine
+from .. import migrations
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+def test_check_schema_rejects_unmigrated_database(engine):
+    assert migrations.current_version(engine) == 0
+    
+    with pytest.raises(migrations.SchemaVersionError):
+        migrations.check_schema(engine)
+
+def test_upgrade_creates_tables(engine):
+    applied = migrations.upgrade(engine)
+    
+    assert applied == [version for version, _, _ in migrations.MIGRATIONS]
+    assert migrations.check_schema(engine) == migrations.LATEST_VERSION
+    
+    tables = inspect(engine).get_table_names()
+    assert "users" in tables
+    assert "content" in tables
+    assert "analytics" in tables
+
+def test_upgrade_is_idempotent(engine):
+    migrations.upgrade(engine)
+    
+    assert migrations.upgrade(engine) == []
+    assert migrations.current_version(engine) == migrations.LATEST_VERSION
+
+def test_upgrade_converts_stringified_profile_fields(engine):
+    migrations.upgrade(engine, target=2)
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (name, skills, interests, experience) "
+            "VALUES ('Legacy', :skills, :interests, :experience)"
+        ), {"skills": "['Python', 'ML']", "interests": "AI, Startups", "experience": "Five years at Acme"})
+    
+    assert migrations.upgrade(engine, target=3) == [3]
+    
+    with engine.connect() as connection:
+        row = connection.execute(text("SELECT skills, interests, experience FROM users")).one()
+    assert json.loads(row.skills) == ["Python", "ML"]
+    assert json.loads(row.interests) == ["AI", "Startups"]
+    assert json.loads(row.experience) == [{"description": "Five years at Acme"}]
@@ -0,0 +1,60 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from ..database import Base
+from ..models import User
+from .. import pagination
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    # Rows inserted in one statement share the same created_at value
+    session.add_all([User(linkedin_profile_url=f"https://www.linkedin.com/in/page{i}") for i in range(25)])
+    session.commit()
+    yield session
+    session.close()
+
+def collect_pages(db, order_by, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = pagination.keyset_select(User, order_by, cursor, limit)
+        items, cursor = pagination.paginate(db.execute(query).scalars().all(), order_by, limit)
+        ids.extend(item.id for item in items)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+@pytest.mark.parametrize("order_by", pagination.ORDERINGS)
+def test_keyset_pages_cover_all_rows_once(db, order_by):
+    ids, pages = collect_pages(db, order_by, limit=10)
+    
+    assert pages == 3
+    assert sorted(ids) == list(range(1, 26))
+    assert len(set(ids)) == 25
+    if order_by.startswith("-"):
+        assert ids == sorted(ids, reverse=True)
+    else:
+        assert ids == sorted(ids)
+
+def test_last_page_has_no_cursor(db):
+    query = pagination.keyset_select(User, "id", None, 25)
+    items, next_cursor = pagination.paginate(db.execute(query).scalars().all(), "id", 25)
+    
+    assert len(items) == 25
+    assert next_cursor is None
+
+def test_cursor_is_bound_to_ordering(db):
+    cursor = pagination.encode_cursor("id", db.get(User, 5))
+    
+    assert pagination.decode_cursor(cursor, "id") == 5
+    with pytest.raises(HTTPException):
+        pagination.decode_cursor(cursor, "-created_at")
+
+def test_invalid_cursor_and_ordering_rejected():
+    with pytest.raises(HTTPException):
+        pagination.decode_cursor("not-a-cursor", "id")
+    with pytest.raises(HTTPException):
+        pagination.keyset_select(User, "name")
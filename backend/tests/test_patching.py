@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import create_engine, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+from ..database import Base
+from ..models import User, Content
+from .. import patching
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(linkedin_profile_url="https://www.linkedin.com/in/patchuser", name="Patch User", headline="Engineer"))
+    session.commit()
+    yield session
+    session.close()
+
+def test_patch_updates_only_given_fields(db):
+    row = patching.patch_row(db, User, 1, {"headline": "Senior Engineer"})
+    
+    assert row["headline"] == "Senior Engineer"
+    assert row["name"] == "Patch User"
+    assert row["updated_at"] is not None
+
+def test_patch_missing_row_returns_none(db):
+    assert patching.patch_row(db, User, 999, {"headline": "Nobody"}) is None
+    assert patching.patch_row(db, User, 999, {}) is None
+
+def test_empty_patch_returns_current_row(db):
+    row = patching.patch_row(db, User, 1, {})
+    
+    assert row["name"] == "Patch User"
+    assert row["updated_at"] is None
+
+def test_update_returning_support():
+    assert patching.supports_update_returning(postgresql.dialect())
+    assert not patching.supports_update_returning(sqlite.dialect())
+
+def test_postgres_patch_is_single_statement():
+    table = Content.__table__
+    statement = update(table).where(table.c.id == 1).values(title="New title").returning(*table.c)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    
+    assert "RETURNING" in sql
+    assert "title=" in sql
+    assert "body=" not in sql
@@ -0,0 +1,92 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from .. import database
+from ..database import Base, get_db, create_db_engine
+from ..main import read_your_writes
+from ..models import User
+from ..replicas import ReplicaRouter
+from ..routers import users
+
+def create_database(path, name):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(linkedin_profile_url=f"https://www.linkedin.com/in/{name.lower()}", name=name))
+    session.commit()
+    session.close()
+    return engine
+
+@pytest.fixture
+def engines(tmp_path):
+    # The two files hold different rows, so each response shows which database served it
+    primary = create_database(tmp_path / "primary.db", "Primary")
+    replica = create_database(tmp_path / "replica.db", "Replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+@pytest.fixture
+def client(engines, monkeypatch):
+    primary, replica = engines
+    PrimarySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=primary)
+
+    def override_get_db():
+        db = PrimarySessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter([replica]))
+    app = FastAPI()
+    app.middleware("http")(read_your_writes)
+    app.include_router(users.router, prefix="/api/v1/users")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+def test_reads_go_to_replica(client):
+    response = client.get("/api/v1/users/1")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Replica"
+    assert database.replica_router.replicas[0].active == 0
+
+def test_consistency_header_reads_primary(client):
+    response = client.get("/api/v1/users/1", headers={database.READ_CONSISTENCY_HEADER: "primary"})
+    assert response.json()["name"] == "Primary"
+
+def test_reads_follow_writes_to_primary(client):
+    response = client.post("/api/v1/users/", json={"linkedin_profile_url": "https://www.linkedin.com/in/writer", "name": "Writer"})
+    assert response.status_code == 201
+    assert database.READ_PRIMARY_COOKIE in response.cookies
+
+    # The cookie set by the write pins the client's reads to the primary
+    response = client.get(f"/api/v1/users/{response.json()['id']}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Writer"
+
+def test_lagging_replica_is_skipped(client, engines, monkeypatch):
+    _, replica = engines
+    monkeypatch.setattr(database, "replica_router", ReplicaRouter([replica], max_lag=5, lag_probe=lambda engine: 30.0))
+
+    response = client.get("/api/v1/users/1")
+    assert response.json()["name"] == "Primary"
+
+def test_unreachable_replica_is_skipped(engines):
+    def failing_probe(engine):
+        raise ConnectionError("replica down")
+
+    router = ReplicaRouter([engines[1]], lag_probe=failing_probe)
+    assert router.choose() is None
+    assert router.status()[0]["healthy"] is False
+
+def test_least_busy_replica_is_chosen(engines):
+    router = ReplicaRouter(list(engines), lag_probe=lambda engine: 0.0)
+
+    first = router.choose()
+    second = router.choose()
+    assert first is not second
+
+    router.release(first)
+    assert router.choose() is first
@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, func
+from sqlalchemy.orm import sessionmaker
+from ..database import create_db_engine, get_db
+from ..models import User, Content, Analytics, AnalyticsSnapshot
+from ..routers import analytics
+from .. import migrations, snapshots
+
+NOW = datetime(2025, 8, 20, 12, 0, tzinfo=timezone.utc)
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'snapshots.db'}")
+    migrations.upgrade(engine)
+    session = sessionmaker(bind=engine)()
+    session.add(User(id=1, linkedin_profile_url="https://www.linkedin.com/in/snapshotuser", name="Snapshot User"))
+    session.commit()
+    session.add_all([Content(id=1, user_id=1, title="First"), Content(id=2, user_id=1, title="Second")])
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def client(engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(analytics.router, prefix="/api/v1/analytics")
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+def test_history_and_latest(db):
+    for hours, likes in [(3, 10), (2, 25), (1, 40)]:
+        snapshots.record_snapshots(db, [{"content_id": 1, "likes": likes}], captured_at=NOW - timedelta(hours=hours))
+    snapshots.record_snapshots(db, [{"content_id": 2, "likes": 5}], captured_at=NOW)
+    db.commit()
+
+    history = db.execute(snapshots.history_select(1)).scalars().all()
+    assert [snapshot.likes for snapshot in history] == [10, 25, 40]
+
+    recent = db.execute(snapshots.history_select(1, since=NOW - timedelta(hours=2))).scalars().all()
+    assert [snapshot.likes for snapshot in recent] == [25, 40]
+
+    latest = db.execute(snapshots.latest_select()).mappings().all()
+    assert [(row["content_id"], row["likes"]) for row in latest] == [(1, 40), (2, 5)]
+
+def test_retention_and_downsampling(engine, db):
+    old_day = NOW - timedelta(days=60)
+    snapshots.record_snapshots(db, [{"content_id": 1, "likes": 1}], captured_at=old_day)
+    snapshots.record_snapshots(db, [{"content_id": 1, "likes": 2}], captured_at=old_day + timedelta(hours=6))
+    snapshots.record_snapshots(db, [{"content_id": 1, "likes": 3}], captured_at=NOW - timedelta(hours=2))
+    snapshots.record_snapshots(db, [{"content_id": 1, "likes": 4}], captured_at=NOW - timedelta(hours=1))
+    snapshots.record_snapshots(db, [{"content_id": 1, "likes": 0}], captured_at=NOW - timedelta(days=400))
+    db.commit()
+
+    with engine.begin() as connection:
+        result = snapshots.apply_retention(connection, raw_days=30, retention_days=365, now=NOW)
+
+    assert result["deleted"] == 1
+    assert result["downsampled"] == 1
+    history = db.execute(snapshots.history_select(1)).scalars().all()
+    # Old days keep their last snapshot, recent ones keep every snapshot
+    assert [snapshot.likes for snapshot in history] == [2, 3, 4]
+
+def test_migration_seeds_snapshots_from_analytics(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    migrations.upgrade(engine, target=3)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert().values(id=1, name="Seed User"))
+        connection.execute(Content.__table__.insert().values(id=1, user_id=1, title="Seeded"))
+        connection.execute(Analytics.__table__.insert().values(content_id=1, likes=7))
+
+    assert migrations.upgrade(engine) == [4]
+    with engine.connect() as connection:
+        assert connection.execute(select(AnalyticsSnapshot.likes)).scalars().all() == [7]
+    engine.dispose()
+
+def test_partitions_only_on_postgres(engine):
+    with engine.begin() as connection:
+        assert snapshots.ensure_partitions(connection) == []
+    assert snapshots.partition_name(NOW) == "analytics_snapshots_2025_08"
+
+def test_snapshot_endpoints(client, db):
+    response = client.post("/api/v1/analytics/snapshots", json=[
+        {"content_id": 1, "likes": 10, "impressions": 100},
+        {"content_id": 2, "likes": 3},
+    ])
+    assert response.status_code == 201
+    assert response.json() == {"created": 2}
+
+    response = client.post("/api/v1/analytics/snapshots", json=[{"content_id": 999}])
+    assert response.status_code == 404
+
+    # Writes through the mutable analytics row are kept as history too
+    response = client.post("/api/v1/analytics/", json={"content_id": 1, "likes": 20})
+    assert response.status_code == 201
+    response = client.patch(f"/api/v1/analytics/{response.json()['id']}", json={"likes": 30})
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/analytics/content/1/history")
+    assert response.status_code == 200
+    assert [snapshot["likes"] for snapshot in response.json()] == [10, 20, 30]
+
+    response = client.get("/api/v1/analytics/latest", params={"content_id": [1]})
+    assert response.status_code == 200
+    assert [(row["content_id"], row["likes"]) for row in response.json()] == [(1, 30)]
+    assert db.execute(select(func.count()).select_from(AnalyticsSnapshot)).scalar() == 4
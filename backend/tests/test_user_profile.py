@@ -105,4 +105,30 @@ def test_get_content_preferences():
     assert len(result["optimal_posting_times"]) == 3
     assert "08:00" in result["optimal_posting_times"]
     assert "12:00" in result["optimal_posting_times"]
-    assert "18:00" in result["optimal_posting_times"]
\ No newline at end of file
+    assert "18:00" in result["optimal_posting_times"]
+
+def test_profile_analysis_is_memoized_per_profile_version():
+    user_data = {
+        "id": 7,
+        "name": "Jane Doe",
+        "headline": "Senior Data Scientist",
+        "about": "",
+        "skills": ["Python"],
+        "experience": [{"title": "Engineering Manager"}]
+    }
+    first = user_profile_service.analyze_user_profile(user_data)
+    first["content_themes"].append("Mutated")
+    second = user_profile_service.analyze_user_profile(dict(user_data))
+    assert second["content_themes"] == ["Technology"]
+    assert user_profile_service.analyze_user_profile.cache_info()["hits"] == 1
+
+    # Changing an analyzed field recomputes and replaces the user's entry
+    third = user_profile_service.analyze_user_profile({**user_data, "skills": ["Python", "Marketing"]})
+    assert sorted(third["content_themes"]) == ["Business", "Technology"]
+    info = user_profile_service.analyze_user_profile.cache_info()
+    assert (info["misses"], info["entries"]) == (2, 1)
+
+    # Fields the preferences do not read leave them memoized
+    user_profile_service.get_content_preferences(user_data)
+    user_profile_service.get_content_preferences({**user_data, "headline": "Principal Data Scientist"})
+    assert user_profile_service.get_content_preferences.cache_info()["hits"] == 1
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the cold-start import cost of the backend
+
+Runs `python -X importtime -c "import backend.main"` in fresh interpreters,
+reports the wall time of the import and the slowest modules by cumulative
+import time. Pass --max-ms to fail when the import exceeds a budget, so
+cold-start regressions show up in CI.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5 --top 15
+    python benchmarks/bench_import_time.py --module backend.main --max-ms 1500
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output into (module, self_us, cumulative_us) rows
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module):
+    """
+    Import the module in a fresh interpreter and return wall time and import rows
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="backend.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median import exceeds this")
+    args = parser.parse_args()
+
+    # The first run warms the bytecode cache and is not counted
+    measure(args.module)
+    timings = []
+    rows = []
+    for _ in range(args.runs):
+        elapsed_ms, rows = measure(args.module)
+        timings.append(elapsed_ms)
+
+    median_ms = statistics.median(timings)
+    print(f"import {args.module}: median={median_ms:.1f}ms "
+          f"min={min(timings):.1f}ms max={max(timings):.1f}ms runs={args.runs}")
+
+    own = [row for row in rows if row[0].strip().startswith(args.module.split(".")[0])]
+    print("\nSlowest modules by cumulative import time (last run):")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    print("\nProject modules:")
+    for name, self_us, cumulative_us in sorted(own, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\nFAIL: median import time {median_ms:.1f}ms exceeds budget {args.max_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()